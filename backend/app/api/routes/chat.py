@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, WebSocket
 from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from app.core.storage.database import get_db
 from app.models.database import ChatSession, Project, ContentBlock, File
@@ -30,6 +30,10 @@ from app.core.storage.storage_factory import get_storage
 
 router = APIRouter(prefix="/chats", tags=["chat"])
 
+# Validate whole result lists in one call instead of one model_validate per row
+_SESSION_LIST_ADAPTER = TypeAdapter(list[ChatSessionResponse])
+_BLOCK_LIST_ADAPTER = TypeAdapter(list[ContentBlockResponse])
+
 
 # Workspace file models
 class WorkspaceFile(BaseModel):
@@ -75,7 +79,7 @@ async def list_chat_sessions(
     sessions = result.scalars().all()
 
     return ChatSessionListResponse(
-        chat_sessions=[ChatSessionResponse.model_validate(s) for s in sessions],
+        chat_sessions=_SESSION_LIST_ADAPTER.validate_python(sessions, from_attributes=True),
         total=total,
     )
 
@@ -232,7 +236,7 @@ async def list_content_blocks(
     blocks = result.scalars().all()
 
     return ContentBlockListResponse(
-        blocks=[ContentBlockResponse.model_validate(b) for b in blocks],
+        blocks=_BLOCK_LIST_ADAPTER.validate_python(blocks, from_attributes=True),
         total=total,
     )
 
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File as FastAPIFile
 from fastapi.responses import FileResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -15,6 +16,9 @@ from app.core.sandbox import is_allowed_file
 
 router = APIRouter(prefix="/files", tags=["files"])
 
+# Validate whole result lists in one call instead of one model_validate per row
+_FILE_LIST_ADAPTER = TypeAdapter(list[FileSchema])
+
 
 @router.post("/upload/{project_id}", response_model=FileSchema, status_code=status.HTTP_201_CREATED)
 async def upload_file(
@@ -103,7 +107,7 @@ async def list_project_files(
     total = total_result.scalar_one()
 
     return FileListResponse(
-        files=[FileSchema.model_validate(f) for f in files],
+        files=_FILE_LIST_ADAPTER.validate_python(files, from_attributes=True),
         total=total,
     )
 
@@ -1,6 +1,7 @@
 """Project API routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -23,6 +24,10 @@ from app.core.storage.file_manager import get_file_manager
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Validate whole result lists in one call instead of one model_validate per row
+_PROJECT_LIST_ADAPTER = TypeAdapter(list[ProjectResponse])
+_SESSION_LIST_ADAPTER = TypeAdapter(list[ChatSessionResponse])
+
 
 @router.get("", response_model=ProjectListResponse)
 async def list_projects(
@@ -42,7 +47,7 @@ async def list_projects(
     projects = result.scalars().all()
 
     return ProjectListResponse(
-        projects=[ProjectResponse.model_validate(p) for p in projects],
+        projects=_PROJECT_LIST_ADAPTER.validate_python(projects, from_attributes=True),
         total=total,
     )
 
@@ -400,6 +405,6 @@ async def list_project_chat_sessions(
     sessions = result.scalars().all()
 
     return ChatSessionListResponse(
-        chat_sessions=[ChatSessionResponse.model_validate(s) for s in sessions],
+        chat_sessions=_SESSION_LIST_ADAPTER.validate_python(sessions, from_attributes=True),
         total=total,
     )
@@ -1,7 +1,7 @@
 """Base tool interface and registry for ReAct agent."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Type, Callable
+from typing import Dict, Any, List, Optional, Type, Callable, AsyncIterator
 from pydantic import BaseModel, Field, ValidationError
 import json
 
@@ -161,6 +161,20 @@ class Tool(ABC):
         """Execute the tool with given parameters."""
         pass
 
+    async def execute_stream(self, **kwargs) -> AsyncIterator[str]:
+        """
+        Execute the tool and yield its output in chunks.
+
+        Tools that can produce output incrementally should override this.
+        The default implementation runs execute() and yields the full output once,
+        preceded by the error for a failed result.
+        """
+        result = await self.execute(**kwargs)
+        if not result.success and result.error:
+            yield f"Error: {result.error}" + (f"\n{result.output}" if result.output else "")
+        else:
+            yield result.output
+
     def format_for_llm(self) -> Dict[str, Any]:
         """Format tool definition for LLM function calling (OpenAI format)."""
         parameters_dict = {
@@ -1,6 +1,9 @@
 """File operation tools for agent."""
 
-from typing import List, Type
+import codecs
+import hashlib
+import shlex
+from typing import AsyncIterator, List, Type
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from app.core.agent.tools.base import Tool, ToolParameter, ToolResult
 from app.core.sandbox.container import SandboxContainer
@@ -61,6 +64,33 @@ class FileWriteInput(BaseModel):
         return v
 
 
+class _NumberedLines:
+    """Incrementally formats text as FileReadTool's line-numbered output."""
+
+    def __init__(self):
+        self.line_count = 0
+        self.char_count = 0
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Format the lines completed by text; the trailing partial line is held back."""
+        self.char_count += len(text)
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        if not lines:
+            return ""
+
+        start = self.line_count
+        self.line_count += len(lines)
+        formatted = "\n".join(f"{i:>4}: {line}" for i, line in enumerate(lines, start + 1))
+        return ("\n" if start else "") + formatted
+
+    def close(self) -> str:
+        """Format the last line."""
+        self.line_count += 1
+        return ("\n" if self.line_count > 1 else "") + f"{self.line_count:>4}: {self._pending}"
+
+
 class FileReadTool(Tool):
     """Tool for reading files from the sandbox environment."""
 
@@ -129,6 +159,26 @@ class FileReadTool(Tool):
                     metadata={"path": path},
                 )
 
+            # Text files are formatted as they stream in; binary files and read
+            # errors go through the buffered read below
+            lines = _NumberedLines()
+            try:
+                output_msg = "".join([chunk async for chunk in self._stream_text(path, lines)])
+            except Exception:
+                output_msg = None
+
+            if output_msg is not None:
+                return ToolResult(
+                    success=True,
+                    output=output_msg,
+                    metadata={
+                        "path": path,
+                        "size": lines.char_count,
+                        "is_binary": False,
+                        "line_count": lines.line_count,
+                    },
+                )
+
             # Read file from container
             content = await self._container.read_file(path)
 
@@ -214,6 +264,66 @@ class FileReadTool(Tool):
                 metadata={"path": path},
             )
 
+    async def _stream_text(
+        self, path: str, lines: _NumberedLines, strict: bool = True
+    ) -> AsyncIterator[str]:
+        """Yield line-numbered text from the container's file stream.
+
+        Raises UnicodeDecodeError if the content is not UTF-8. With strict=False only
+        the first chunk is checked; later undecodable bytes are replaced with U+FFFD.
+        """
+        stream = self._container.read_file_stream(path)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            async for chunk in stream:
+                if out := lines.feed(decoder.decode(chunk)):
+                    yield out
+                if not strict:
+                    decoder.errors = "replace"
+            if out := lines.feed(decoder.decode(b"", final=True)):
+                yield out
+        finally:
+            await stream.aclose()
+
+        yield lines.close()
+
+    async def execute_stream(self, path: str, **kwargs) -> AsyncIterator[str]:
+        """Stream a text file from the sandbox as line-numbered output.
+
+        Lines are yielded as soon as their chunk arrives from the container, so the
+        first output is available before the whole file has been read. For a file
+        that is valid UTF-8 throughout, the concatenated chunks equal the output of
+        execute() for the same file.
+
+        Binary detection only looks at the first chunk: a file whose first chunk
+        fails to decode, an invalid path or a read error falls back to execute().
+        Once output has started, later undecodable bytes are replaced with U+FFFD
+        instead of switching to execute()'s binary result, and a read error ends the
+        stream with an error line.
+
+        Args:
+            path: Path to the file to read
+
+        Yields:
+            Chunks of line-numbered file content
+        """
+        if not validate_file_path(path):
+            async for chunk in super().execute_stream(path=path, **kwargs):
+                yield chunk
+            return
+
+        started = False
+        try:
+            async for chunk in self._stream_text(path, _NumberedLines(), strict=False):
+                started = True
+                yield chunk
+        except Exception as e:
+            if started:
+                yield f"\nError: Failed to read file: {str(e)}"
+                return
+            async for chunk in super().execute_stream(path=path, **kwargs):
+                yield chunk
+
 
 class FileWriteTool(Tool):
     """Tool for writing/creating files in the sandbox environment."""
@@ -291,6 +401,19 @@ class FileWriteTool(Tool):
             # Construct full path in output directory
             output_path = f"/workspace/out/{filename}"
 
+            # Skip the write entirely if the file already has this exact content
+            if await self._has_content(output_path, content):
+                return ToolResult(
+                    success=True,
+                    output=f"No change to {filename} in /workspace/out (content identical)",
+                    metadata={
+                        "filename": filename,
+                        "output_path": output_path,
+                        "size": len(content),
+                        "skipped": True,
+                    },
+                )
+
             # Write file to container
             success = await self._container.write_file(output_path, content)
 
@@ -319,3 +442,15 @@ class FileWriteTool(Tool):
                 error=f"Failed to write file: {str(e)}",
                 metadata={"filename": filename},
             )
+
+    async def _has_content(self, path: str, content: str) -> bool:
+        """Check whether the file at path already holds exactly this content.
+
+        Compares SHA-256 digests so only the hash crosses the container boundary.
+        Any failure (missing file, no sha256sum) is treated as "changed".
+        """
+        expected = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        exit_code, stdout, _ = await self._container.execute(
+            f"sha256sum {shlex.quote(path)} 2>/dev/null", workdir="/workspace", timeout=10
+        )
+        return exit_code == 0 and stdout.split(" ", 1)[0] == expected
@@ -3,6 +3,7 @@
 from typing import List
 from pathlib import Path
 from app.core.agent.tools.base import Tool, ToolParameter, ToolResult
+from app.core.agent.tools.search_tool_unified import build_grep_pattern_args
 from app.core.sandbox.container import SandboxContainer
 
 
@@ -196,16 +197,17 @@ class SearchTool(Tool):
                 )
 
             # Format output
-            output = f"Found {len(results)} file(s) matching '{pattern}':\n"
-            for result in results[:max_results]:
-                output += f"  - {result}\n"
+            parts = [f"Found {len(results)} file(s) matching '{pattern}':"]
+            parts.extend(f"  - {result}" for result in results[:max_results])
 
             if len(results) > max_results:
-                output += f"\n... and {len(results) - max_results} more results (use max_results to see more)"
+                parts.append(
+                    f"\n... and {len(results) - max_results} more results (use max_results to see more)"
+                )
 
             return ToolResult(
                 success=True,
-                output=output.strip(),
+                output="\n".join(parts).strip(),
                 metadata={
                     "pattern": pattern,
                     "matches": len(results),
@@ -231,14 +233,14 @@ class SearchTool(Tool):
         """Search for text content within files."""
         try:
             # Use grep to search file contents
-            # Escape pattern for shell
-            safe_pattern = pattern.replace("'", "'\\''")
+            # Escape pattern for shell (literal alternations use grep -F)
+            grep_args = build_grep_pattern_args(pattern)
             safe_file_pattern = file_pattern.replace("'", "'\\''")
 
             # Build grep command with file pattern filter
             grep_cmd = (
                 f"find {search_path} -type f -name '{safe_file_pattern}' "
-                f"-exec grep -l '{safe_pattern}' {{}} \\; 2>/dev/null | head -n {max_results}"
+                f"-exec grep -l {grep_args} {{}} \\; 2>/dev/null | head -n {max_results}"
             )
 
             exit_code, stdout, stderr = await self._container.execute(
@@ -272,7 +274,7 @@ class SearchTool(Tool):
             detailed_results = []
             for file_path in results[:max_results]:
                 # Get matching lines with context
-                context_cmd = f"grep -n '{safe_pattern}' {file_path} 2>/dev/null | head -n 3"
+                context_cmd = f"grep -n {grep_args} {file_path} 2>/dev/null | head -n 3"
                 _, context_stdout, _ = await self._container.execute(
                     context_cmd,
                     workdir="/workspace",
@@ -288,21 +290,20 @@ class SearchTool(Tool):
                 )
 
             # Format output
-            output = f"Found '{pattern}' in {len(results)} file(s):\n\n"
+            parts = [f"Found '{pattern}' in {len(results)} file(s):", ""]
             for result in detailed_results:
-                output += f"📄 {result['file']}\n"
-                for match_line in result["matches"]:
-                    output += f"   {match_line}\n"
-                output += "\n"
+                parts.append(f"📄 {result['file']}")
+                parts.extend(f"   {match_line}" for match_line in result["matches"])
+                parts.append("")
 
             if len(results) > max_results:
-                output += (
+                parts.append(
                     f"... and {len(results) - max_results} more files (use max_results to see more)"
                 )
 
             return ToolResult(
                 success=True,
-                output=output.strip(),
+                output="\n".join(parts).strip(),
                 metadata={
                     "pattern": pattern,
                     "matches": len(results),
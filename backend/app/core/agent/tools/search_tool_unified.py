@@ -1,9 +1,13 @@
 """Unified search tool - AST-aware for code structures, text-based for content."""
 
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import asyncio
 import json
+import os
 import re
+import stat
 from app.core.agent.tools.base import Tool, ToolParameter, ToolResult
 from app.core.sandbox.container import SandboxContainer
 
@@ -82,6 +86,155 @@ LANGUAGE_ALIASES: Dict[str, str] = {
     "c++": "cpp",
 }
 
+# Characters with special meaning in grep's default (basic) regular expressions.
+# In that syntax '|', '+', '?', '(', ')', '{' and '}' are ordinary characters.
+_BRE_METACHARS = frozenset(".[]*^$\\")
+
+
+def _shell_quote(value: str) -> str:
+    """Wrap a value in single quotes for the container shell."""
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+def parse_literal_alternation(pattern: str) -> Optional[Tuple[str, ...]]:
+    """Split a grep alternation like 'foo\\|bar\\|baz' into its literal alternatives.
+
+    Content queries are grep basic regular expressions, where '\\|' separates
+    alternatives and a plain '|' is an ordinary character. One '\\(...\\)' group
+    around the whole pattern is accepted. Returns None if the pattern has no
+    alternation or any alternative contains other regex syntax.
+    """
+    body = pattern
+    if body.startswith("\\(") and body.endswith("\\)"):
+        body = body[2:-2]
+
+    if "\\|" not in body:
+        return None
+
+    literals = tuple(body.split("\\|"))
+    if any(not literal or _BRE_METACHARS.intersection(literal) for literal in literals):
+        return None
+    return literals
+
+
+def build_grep_pattern_args(pattern: str) -> str:
+    """Build the pattern arguments of a grep command line.
+
+    Alternations of fixed strings become 'grep -F -e lit1 -e lit2 ...', which grep
+    matches in a single Aho-Corasick pass instead of a backtracking regex.
+    """
+    literals = parse_literal_alternation(pattern)
+    if literals:
+        return "-F " + " ".join(f"-e {_shell_quote(literal)}" for literal in literals)
+    return _shell_quote(pattern)
+
+
+@lru_cache(maxsize=128)
+def compile_content_pattern(pattern: str) -> Optional[re.Pattern[bytes]]:
+    """Compile a content query for in-process scanning.
+
+    Only plain text and literal alternations are compiled, since they match the
+    same lines in Python as in grep. Anything else returns None and must be
+    searched with grep inside the container.
+    """
+    literals = parse_literal_alternation(pattern)
+    if literals:
+        return re.compile(b"|".join(re.escape(literal.encode("utf-8")) for literal in literals))
+    if not pattern or _BRE_METACHARS.intersection(pattern):
+        return None
+    return re.compile(re.escape(pattern.encode("utf-8")))
+
+
+# Larger files are skipped by the in-process content scan
+MAX_SCAN_FILE_BYTES = 16 * 1024 * 1024
+
+
+def resolves_within(path: str, root: str) -> bool:
+    """Check that a path, with all symlinks resolved, stays inside root."""
+    real_root = os.path.realpath(root)
+    real = os.path.realpath(path)
+    return real == real_root or real.startswith(real_root + os.sep)
+
+
+def _read_regular_file(path: Path, root: str) -> Optional[bytes]:
+    """Read a regular file under root without following symlinks out of it.
+
+    The sandbox can write to the scanned directory, so symlinks are skipped,
+    the final component is opened with O_NOFOLLOW, and the opened file is
+    checked again against root in case a parent directory was swapped for a
+    symlink in between. Non-regular files (FIFOs, devices) and files larger
+    than MAX_SCAN_FILE_BYTES return None.
+
+    Files are read rather than mmap'd: the sandbox can truncate a file while it
+    is mapped, and touching the lost pages would kill the process with SIGBUS.
+    """
+    if path.is_symlink() or not resolves_within(str(path), root):
+        return None
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_size > MAX_SCAN_FILE_BYTES:
+            return None
+        proc_fd = f"/proc/self/fd/{fd}"
+        if os.path.exists(proc_fd) and not resolves_within(proc_fd, root):
+            return None
+        # The file may have grown since fstat; never read past the cap
+        data = f.read(MAX_SCAN_FILE_BYTES + 1)
+        return data if len(data) <= MAX_SCAN_FILE_BYTES else None
+
+
+def scan_content_local(
+    host_root: str,
+    container_root: str,
+    regex: re.Pattern[bytes],
+    file_pattern: Optional[str],
+    max_results: int,
+    max_lines: int = 3,
+) -> List[Tuple[str, List[str]]]:
+    """Search regular files under a host directory in-process.
+
+    Symlinks and anything resolving outside host_root are skipped, since the
+    sandbox controls the directory's contents. Files over MAX_SCAN_FILE_BYTES
+    are skipped as well.
+
+    Returns:
+        Up to max_results (container_path, ["line_no:line", ...]) tuples, with
+        at most max_lines matching lines per file, in grep -n format
+    """
+    results: List[Tuple[str, List[str]]] = []
+    for file_path in sorted(Path(host_root).rglob(file_pattern or "*")):
+        if len(results) >= max_results:
+            break
+        try:
+            data = _read_regular_file(file_path, host_root)
+        except (OSError, ValueError):
+            continue
+        if not data:
+            continue
+
+        lines: List[str] = []
+        line_no, counted_to = 1, 0
+        for match in regex.finditer(data):
+            start = match.start()
+            if start < counted_to:
+                continue  # Another match on a line already reported
+            line_no += data.count(b"\n", counted_to, start)
+            line_start = data.rfind(b"\n", 0, start) + 1
+            line_end = data.find(b"\n", start)
+            if line_end == -1:
+                line_end = len(data)
+            text = data[line_start:line_end].decode("utf-8", errors="replace")
+            lines.append(f"{line_no}:{text}")
+            if len(lines) >= max_lines:
+                break
+            counted_to = line_end
+
+        if lines:
+            relative = os.path.relpath(file_path, host_root)
+            results.append((os.path.normpath(os.path.join(container_root, relative)), lines))
+
+    return results
+
 
 class UnifiedSearchTool(Tool):
     """Unified search tool - automatically uses the best search method."""
@@ -302,13 +455,49 @@ class UnifiedSearchTool(Tool):
         self, query: str, search_path: Path, file_pattern: Optional[str], max_results: int
     ) -> ToolResult:
         """Text/grep-based content search."""
-        safe_query = query.replace("'", "'\\''")
+        host_root = self._container.get_host_tree(str(search_path))
+        if host_root and not resolves_within(host_root, self._container.host_path):
+            host_root = None  # Search path is a symlink leaving the workspace
+        regex = compile_content_pattern(query) if host_root else None
+
+        if regex is not None and os.path.isdir(host_root):
+            # Workspace is bind-mounted: scan it in-process instead of exec'ing grep
+            matches = await asyncio.to_thread(
+                scan_content_local, host_root, str(search_path), regex, file_pattern, max_results
+            )
+        else:
+            matches = await self._grep_text(query, search_path, file_pattern, max_results)
+
+        if not matches:
+            return ToolResult(
+                success=True,
+                output=f"No files found containing: {query}",
+                metadata={"query": query, "mode": "text", "matches": 0},
+            )
+
+        parts = [f"Found '{query}' in {len(matches)} file(s):", ""]
+        for file_path, context_lines in matches:
+            parts.append(f"📄 {file_path}")
+            parts.extend(f"   {line[:100]}" for line in context_lines)
+            parts.append("")
+
+        return ToolResult(
+            success=True,
+            output="\n".join(parts).strip(),
+            metadata={"query": query, "mode": "text", "matches": len(matches)},
+        )
+
+    async def _grep_text(
+        self, query: str, search_path: Path, file_pattern: Optional[str], max_results: int
+    ) -> List[Tuple[str, List[str]]]:
+        """Run grep inside the container and collect up to 3 matching lines per file."""
+        grep_args = build_grep_pattern_args(query)
 
         if file_pattern:
             safe_pattern = file_pattern.replace("'", "'\\''")
-            cmd = f"find {search_path} -type f -name '{safe_pattern}' -exec grep -l '{safe_query}' {{}} \\; 2>/dev/null | head -n {max_results}"
+            cmd = f"find {search_path} -type f -name '{safe_pattern}' -exec grep -l {grep_args} {{}} \\; 2>/dev/null | head -n {max_results}"
         else:
-            cmd = f"grep -rl '{safe_query}' {search_path} 2>/dev/null | head -n {max_results}"
+            cmd = f"grep -rl {grep_args} {search_path} 2>/dev/null | head -n {max_results}"
 
         exit_code, stdout, stderr = await self._container.execute(
             cmd, workdir="/workspace", timeout=30
@@ -316,35 +505,21 @@ class UnifiedSearchTool(Tool):
 
         files = [f.strip() for f in stdout.strip().split("\n") if f.strip()]
 
-        if not files:
-            return ToolResult(
-                success=True,
-                output=f"No files found containing: {query}",
-                metadata={"query": query, "mode": "text", "matches": 0},
-            )
-
         # Get context for matches
-        output = f"Found '{query}' in {len(files)} file(s):\n\n"
+        matches = []
         for file_path in files[:max_results]:
-            output += f"📄 {file_path}\n"
-            # Get matching lines
-            context_cmd = f"grep -n '{safe_query}' '{file_path}' 2>/dev/null | head -n 3"
+            context_cmd = f"grep -n {grep_args} '{file_path}' 2>/dev/null | head -n 3"
             _, context, _ = await self._container.execute(
                 context_cmd, workdir="/workspace", timeout=10
             )
-            for line in context.strip().split("\n")[:3]:
-                if line.strip():
-                    output += f"   {line[:100]}\n"
-            output += "\n"
-
-        return ToolResult(
-            success=True,
-            output=output.strip(),
-            metadata={"query": query, "mode": "text", "matches": len(files)},
-        )
+            matches.append(
+                (file_path, [line for line in context.strip().split("\n")[:3] if line.strip()])
+            )
+        return matches
 
     async def _search_filename(self, query: str, search_path: Path, max_results: int) -> ToolResult:
         """Find files by name pattern."""
+        query = query.strip()
         safe_query = query.replace("'", "'\\''")
 
         # Handle recursive patterns
@@ -367,13 +542,12 @@ class UnifiedSearchTool(Tool):
                 metadata={"query": query, "mode": "filename", "matches": 0},
             )
 
-        output = f"Found {len(files)} file(s) matching '{query}':\n"
-        for f in files[:max_results]:
-            output += f"  - {f}\n"
+        parts = [f"Found {len(files)} file(s) matching '{query}':"]
+        parts.extend(f"  - {f}" for f in files[:max_results])
 
         return ToolResult(
             success=True,
-            output=output.strip(),
+            output="\n".join(parts).strip(),
             metadata={"query": query, "mode": "filename", "matches": len(files), "files": files},
         )
 
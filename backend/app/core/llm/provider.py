@@ -1,7 +1,9 @@
 """LLM provider abstraction using LiteLLM."""
 
-import os
-from typing import List, Dict, Any, AsyncIterator, Optional
+import hashlib
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, Mapping, Optional, Tuple
 from litellm import acompletion
 import litellm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +12,11 @@ from sqlalchemy import select
 # Disable LiteLLM logging by default
 litellm.suppress_debug_info = True
 
+# Providers shared between create_llm_provider calls with identical arguments,
+# least recently used first. Keys hold a digest of the API key, never the key.
+_PROVIDER_CACHE: "OrderedDict[Tuple[Any, ...], LLMProvider]" = OrderedDict()
+_PROVIDER_CACHE_MAX = 64
+
 
 class LLMProvider:
     """LLM provider using LiteLLM for unified API access."""
@@ -31,38 +38,22 @@ class LLMProvider:
         self.api_key = api_key
         self.config = config
 
-        # Set API key in environment if provided
+        # Read-only base parameters, reused as-is for calls without overrides.
+        # The API key travels with each call rather than through os.environ, so
+        # providers with different keys can coexist in one process.
+        base_params = dict(config)
         if api_key:
-            self._set_api_key(provider, api_key)
+            base_params["api_key"] = api_key
+        self._base_params: Mapping[str, Any] = MappingProxyType(base_params)
 
-    def _set_api_key(self, provider: str, api_key: str):
-        """Set API key in environment based on provider.
+    def _build_params(self, overrides: Dict[str, Any]) -> Mapping[str, Any]:
+        """Merge per-call overrides into the base parameters.
 
-        Uses LiteLLM's provider metadata when available, with fallback
-        to common naming conventions.
+        Calls without overrides reuse the base parameters instead of copying them.
         """
-        from app.core.llm.providers import PROVIDER_METADATA
-
-        provider_lower = provider.lower()
-
-        # First try to get from our provider metadata (synced with LiteLLM)
-        if provider_lower in PROVIDER_METADATA:
-            env_key = PROVIDER_METADATA[provider_lower].get("env_key")
-            if env_key:
-                os.environ[env_key] = api_key
-                return
-
-        # Fallback: try common naming conventions
-        # Most providers use PROVIDER_API_KEY format
-        provider_upper = provider_lower.upper().replace("-", "_")
-        common_patterns = [
-            f"{provider_upper}_API_KEY",
-            f"{provider_upper}AI_API_KEY",
-            f"{provider_upper}_KEY",
-        ]
-
-        # Set the first pattern as default
-        os.environ[common_patterns[0]] = api_key
+        if not overrides:
+            return self._base_params
+        return {**self._base_params, **overrides}
 
     def _build_model_name(self) -> str:
         """Build the full model name for LiteLLM.
@@ -86,8 +77,7 @@ class LLMProvider:
         Returns:
             Completion response or async iterator if streaming
         """
-        # Merge config with kwargs
-        params = {**self.config, **kwargs}
+        params = self._build_params(kwargs)
 
         model_name = self._build_model_name()
 
@@ -122,16 +112,17 @@ class LLMProvider:
         print(f"  Tools count: {len(tools) if tools else 0}")
         print(f"  Messages count: {len(messages)}")
 
-        params = {**self.config, **kwargs}
         model_name = self._build_model_name()
         print(f"  Full model name: {model_name}")
 
         # Add tools to params if provided
         if tools:
-            params["tools"] = tools
-            params["tool_choice"] = "auto"
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
             print("  Tool choice: auto")
 
+        params = self._build_params(kwargs)
+
         try:
             print("[LLM PROVIDER] Calling acompletion...")
             response = await acompletion(model=model_name, messages=messages, stream=True, **params)
@@ -188,9 +179,26 @@ def create_llm_provider(
         api_key: Optional API key
 
     Returns:
-        LLMProvider instance
+        LLMProvider instance, shared between calls with identical arguments
     """
-    return LLMProvider(provider=provider, model=model, api_key=api_key, **llm_config)
+    key_digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+    cache_key = (provider, model, tuple(sorted(llm_config.items())), key_digest)
+    try:
+        hash(cache_key)
+    except TypeError:
+        # Unhashable config values (e.g. nested dicts) cannot be cached
+        return LLMProvider(provider=provider, model=model, api_key=api_key, **llm_config)
+
+    cached = _PROVIDER_CACHE.get(cache_key)
+    if cached is not None:
+        _PROVIDER_CACHE.move_to_end(cache_key)
+        return cached
+
+    instance = LLMProvider(provider=provider, model=model, api_key=api_key, **llm_config)
+    _PROVIDER_CACHE[cache_key] = instance
+    if len(_PROVIDER_CACHE) > _PROVIDER_CACHE_MAX:
+        _PROVIDER_CACHE.popitem(last=False)
+    return instance
 
 
 async def create_llm_provider_with_db(
@@ -220,7 +228,7 @@ async def create_llm_provider_with_db(
     """
     # If API key explicitly provided, use it
     if api_key:
-        return LLMProvider(provider=provider, model=model, api_key=api_key, **llm_config)
+        return create_llm_provider(provider, model, llm_config, api_key=api_key)
 
     # Try to get API key from database
     try:
@@ -242,12 +250,12 @@ async def create_llm_provider_with_db(
             key_record.last_used_at = datetime.utcnow()
             await db.commit()
 
-            return LLMProvider(provider=provider, model=model, api_key=decrypted_key, **llm_config)
+            return create_llm_provider(provider, model, llm_config, api_key=decrypted_key)
     except Exception as e:
         # Log the error but don't fail - fall back to environment variables
         print(f"Warning: Failed to retrieve API key from database: {e}")
 
     # Fallback to environment variable (original behavior)
-    return LLMProvider(
-        provider=provider, model=model, api_key=None, **llm_config  # Will use environment variable
+    return create_llm_provider(
+        provider, model, llm_config, api_key=None  # Will use environment variable
     )
@@ -1,26 +1,100 @@
 """Docker container wrapper for sandbox execution."""
 
 import os
+import io
 import asyncio
-from typing import Tuple
+import tarfile
+from typing import AsyncIterator, Iterable, Tuple
 from docker.models.containers import Container as DockerContainer
 
 
+class _ChunkReader(io.RawIOBase):
+    """Readable file object over an iterator of byte chunks (e.g. a Docker archive stream)."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+# Container paths mounted from separate volumes on top of the /workspace bind mount
+_SEPARATE_MOUNTS = ("/workspace/project_files",)
+
+
 class SandboxContainer:
     """Wrapper for a Docker container used as a sandbox."""
 
-    def __init__(self, container: DockerContainer, workspace_path: str):
+    def __init__(
+        self, container: DockerContainer, workspace_path: str, host_path: str | None = None
+    ):
         """
         Initialize sandbox container.
 
         Args:
             container: Docker container instance
             workspace_path: Host path to workspace directory
+            host_path: Host directory bind-mounted at /workspace, if any
         """
         self.container = container
         self.workspace_path = workspace_path
+        self.host_path = host_path
         self.container_id = container.id
 
+    def get_host_path(self, container_path: str) -> str | None:
+        """
+        Map a container path under /workspace to its bind-mounted host path.
+
+        Args:
+            container_path: Absolute path inside the container
+
+        Returns:
+            Host path, or None if the workspace is not bind-mounted or the path
+            lives on a separate volume (e.g. /workspace/project_files)
+        """
+        if not self.host_path:
+            return None
+
+        path = os.path.normpath(container_path)
+        if path != "/workspace" and not path.startswith("/workspace/"):
+            return None
+        if any(path == mount or path.startswith(mount + "/") for mount in _SEPARATE_MOUNTS):
+            return None
+
+        return os.path.normpath(os.path.join(self.host_path, os.path.relpath(path, "/workspace")))
+
+    def get_host_tree(self, container_path: str) -> str | None:
+        """
+        Map a container directory to its host path if its whole tree is bind-mounted.
+
+        Unlike get_host_path, this also returns None for a directory that contains
+        a separate volume (e.g. /workspace contains /workspace/project_files),
+        since walking the host directory would miss that volume's files.
+
+        Args:
+            container_path: Absolute directory path inside the container
+
+        Returns:
+            Host path, or None if any part of the tree lives elsewhere
+        """
+        path = os.path.normpath(container_path)
+        if any(mount.startswith(path.rstrip("/") + "/") for mount in _SEPARATE_MOUNTS):
+            return None
+        return self.get_host_path(path)
+
     @property
     def is_running(self) -> bool:
         """Check if container is running."""
@@ -193,6 +267,58 @@ class SandboxContainer:
             # Return error as string so FileReadTool can display it
             raise Exception(f"Failed to read file: {str(e)}")
 
+    async def read_file_stream(
+        self, container_path: str, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the raw bytes of a file from the container.
+
+        Unlike read_file, the archive is never buffered in full: the tar stream is
+        unpacked as it arrives and file content is yielded chunk by chunk.
+
+        Args:
+            container_path: Path inside container
+            chunk_size: Maximum size of each yielded chunk in bytes
+
+        Yields:
+            Raw file content chunks
+
+        Raises:
+            FileNotFoundError: If the archive does not contain a regular file
+        """
+
+        def _close(bits):
+            # Docker's archive stream is a generator over the HTTP response;
+            # closing it releases the connection when reading stops early
+            close = getattr(bits, "close", None)
+            if close:
+                close()
+
+        def _open():
+            bits, _ = self.container.get_archive(container_path, chunk_size=chunk_size)
+            try:
+                tar = tarfile.open(fileobj=_ChunkReader(bits), mode="r|")
+                member = tar.next()
+                f = tar.extractfile(member) if member else None
+            except BaseException:
+                _close(bits)
+                raise
+            return bits, tar, f
+
+        bits, tar, f = await asyncio.to_thread(_open)
+        try:
+            if f is None:
+                raise FileNotFoundError(container_path)
+
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            tar.close()
+            _close(bits)
+
     def list_files(self, container_path: str = "/workspace") -> list[str]:
         """
         List files in a directory.
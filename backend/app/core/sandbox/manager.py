@@ -198,7 +198,16 @@ class ContainerPoolManager:
             workspace_display = (
                 f"volume://{session_id}" if hasattr(self.storage, "get_volume_name") else "N/A"
             )
-            sandbox = SandboxContainer(container, workspace_display)
+            # Local storage bind-mounts a host directory, which tools can read in-process
+            host_path = next(
+                (
+                    source
+                    for source, mount in session_volume_config.items()
+                    if mount.get("bind") == "/workspace" and Path(source).is_absolute()
+                ),
+                None,
+            )
+            sandbox = SandboxContainer(container, workspace_display, host_path=host_path)
             self.active_containers[session_id] = sandbox
 
             return sandbox
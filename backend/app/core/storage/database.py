@@ -1,5 +1,7 @@
 """Database setup and session management."""
 
+import functools
+import json
 import os
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
@@ -15,6 +17,8 @@ engine = create_async_engine(
     settings.database_url,
     echo=False,
     future=True,
+    # Compact separators keep JSON columns (agent config, tool lists) small
+    json_serializer=functools.partial(json.dumps, separators=(",", ":")),
 )
 
 # Create async session maker
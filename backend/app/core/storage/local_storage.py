@@ -1,12 +1,158 @@
 """Local filesystem storage backend using bind mounts."""
 
 import asyncio
+import errno
+import functools
+import logging
+import os
 import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from app.core.storage.workspace_storage import WorkspaceStorage, FileInfo
 
+logger = logging.getLogger(__name__)
+
+# Larger buffer for shutil's user-space copy fallback (default is 64 KiB)
+shutil.COPY_BUFSIZE = max(shutil.COPY_BUFSIZE, 1 << 20)
+
+_IS_WINDOWS = os.name == "nt"
+
+# Dedicated pool for workspace filesystem calls, so they never queue behind
+# unrelated blocking work (e.g. S3 requests) on the default executor
+_FS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fs")
+
+# Shared pool for per-file copies, so multi-file copies run concurrently without
+# starving the default executor or the filesystem pool
+_COPY_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="workspace-copy"
+)
+
+
+async def _run_fs(func, /, *args, **kwargs):
+    """Run a blocking filesystem call on the dedicated filesystem pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_FS_POOL, functools.partial(func, *args, **kwargs))
+
+
+# copy_file_range errors meaning "not supported here", e.g. across filesystems
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL}
+
+
+def _copy_file_range(source: str, dest: str) -> bool:
+    """Copy file content with os.copy_file_range.
+
+    copy_file_range moves data inside the kernel (or reflinks it on supporting
+    filesystems), so file content never passes through user space.
+
+    Returns:
+        False if copy_file_range is not supported for these files and nothing
+        was written
+    """
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        total = 0
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+                total += copied
+            return True
+        except OSError as e:
+            # Only fall back if nothing was written yet
+            if e.errno not in _COPY_FILE_RANGE_UNSUPPORTED or total:
+                raise
+            return False
+
+
+def _copy_file(source: str, dest: str) -> None:
+    """Copy a file with its mode and timestamps, like shutil.copy2.
+
+    Content is copied with os.copy_file_range where available, falling back to
+    shutil.copyfile.
+    """
+    if _IS_WINDOWS:
+        # copy2 uses the native CopyFile2 API on Windows
+        shutil.copy2(source, dest)
+        return
+
+    if not (hasattr(os, "copy_file_range") and _copy_file_range(source, dest)):
+        shutil.copyfile(source, dest)
+    shutil.copystat(source, dest)
+
+
+# Upper bound on cached directories; the cache is simply dropped when full
+_KNOWN_DIRS_MAX = 4096
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path: str, content: bytes) -> None:
+    """Write bytes to a path, replacing any existing file.
+
+    Uses raw os.open/os.write so small writes skip the buffered file object.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(content)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _robocopy_tree(source_dir: str, dest_dir: str) -> None:
+    """Copy a directory tree on Windows with multi-threaded robocopy."""
+    result = subprocess.run(
+        ["robocopy", source_dir, dest_dir, "/E", "/MT:32", "/NFL", "/NDL", "/NJH", "/NJS", "/NP"],
+        capture_output=True,
+        text=True,
+    )
+    # robocopy exit codes below 8 all mean success (bit flags for copied/extra files)
+    if result.returncode >= 8:
+        raise OSError(f"robocopy failed with exit code {result.returncode}: {result.stdout}")
+
+
+def _collect_copy_pairs(source_dir: str, dest_dir: str) -> Tuple[List[Tuple[str, str]], set[str]]:
+    """Walk a source tree and pair every file with its destination path.
+
+    Returns:
+        (source, destination) file pairs and the set of destination directories
+        that must exist before copying
+    """
+    pairs: List[Tuple[str, str]] = []
+    dest_dirs: set[str] = set()
+    stack = [(source_dir, dest_dir)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, dst_path))
+                elif entry.is_file():
+                    pairs.append((entry.path, dst_path))
+                    dest_dirs.add(dst_dir)
+    return pairs, dest_dirs
+
+
+_WORKSPACE_PREFIX = "/workspace"
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_host_path(base: str, session_id: str, container_path: str) -> str:
+    """Map a container path to its host path under ``base``, cached per input."""
+    # Remove leading '/workspace' from container path
+    relative_path = container_path.removeprefix(_WORKSPACE_PREFIX).lstrip("/")
+
+    return os.path.join(base, session_id, relative_path)
+
 
 class LocalStorage(WorkspaceStorage):
     """Storage backend using local filesystem with bind mounts."""
@@ -20,12 +166,17 @@ class LocalStorage(WorkspaceStorage):
         """
         self.workspace_base = Path(workspace_base)
         self.workspace_base.mkdir(parents=True, exist_ok=True)
+        self._base = str(self.workspace_base)
+
+        # Directories already known to exist, so writes skip the mkdir call
+        self._known_dirs: set[str] = set()
+        self._known_dirs_lock = threading.Lock()
 
-    def _get_workspace_path(self, session_id: str) -> Path:
+    def _get_workspace_path(self, session_id: str) -> str:
         """Get workspace path for a session."""
-        return self.workspace_base / session_id
+        return os.path.join(self._base, session_id)
 
-    def _get_host_path(self, session_id: str, container_path: str) -> Path:
+    def _get_host_path(self, session_id: str, container_path: str) -> str:
         """
         Convert container path to host filesystem path.
 
@@ -36,40 +187,69 @@ class LocalStorage(WorkspaceStorage):
         Returns:
             Corresponding host filesystem path
         """
-        # Remove leading '/workspace' from container path
-        if container_path.startswith("/workspace/"):
-            relative_path = container_path[len("/workspace/") :]
-        elif container_path.startswith("/workspace"):
-            relative_path = container_path[len("/workspace") :]
-        else:
-            relative_path = container_path.lstrip("/")
-
-        workspace = self._get_workspace_path(session_id)
-        return workspace / relative_path
+        return _compute_host_path(self._base, session_id, container_path)
+
+    def _is_known_dir(self, path: str) -> bool:
+        with self._known_dirs_lock:
+            return path in self._known_dirs
+
+    def _remember_dir(self, path: str) -> None:
+        with self._known_dirs_lock:
+            if len(self._known_dirs) >= _KNOWN_DIRS_MAX:
+                self._known_dirs.clear()
+            self._known_dirs.add(path)
+
+    def _forget_dirs(self, root: str) -> None:
+        """Drop cached directories at or below a deleted path."""
+        root = root.rstrip(os.sep)
+        prefix = root + os.sep
+        with self._known_dirs_lock:
+            self._known_dirs = {
+                d for d in self._known_dirs if d != root and not d.startswith(prefix)
+            }
+
+    def _in_parent_dir(self, path: str, func, *args) -> None:
+        """Run a call that creates path, making its parent directory unless known to exist."""
+        parent = os.path.dirname(path)
+        if not self._is_known_dir(parent):
+            os.makedirs(parent, exist_ok=True)
+            self._remember_dir(parent)
+        try:
+            func(*args)
+        except FileNotFoundError:
+            if os.path.isdir(parent):
+                raise  # Something else is missing, e.g. a copy source
+            # The directory was removed behind our back (the sandbox can
+            # rm -rf inside its bind mount), so recreate it and retry once
+            self._forget_dirs(parent)
+            os.makedirs(parent, exist_ok=True)
+            self._remember_dir(parent)
+            func(*args)
 
     async def write_file(self, session_id: str, container_path: str, content: bytes) -> bool:
         """Write content to a file."""
         try:
             host_path = self._get_host_path(session_id, container_path)
-
-            # Create parent directories
-            await asyncio.to_thread(host_path.parent.mkdir, parents=True, exist_ok=True)
-
-            # Write file
-            await asyncio.to_thread(host_path.write_bytes, content)
+            await _run_fs(self._in_parent_dir, host_path, _write_bytes, host_path, content)
             return True
-        except Exception as e:
-            print(f"Error writing file: {e}")
+        except Exception:
+            logger.exception("Error writing file")
             return False
 
     async def read_file(self, session_id: str, container_path: str) -> bytes:
         """Read a file from the workspace."""
         host_path = self._get_host_path(session_id, container_path)
 
-        if not await asyncio.to_thread(host_path.exists):
-            raise FileNotFoundError(f"File not found: {container_path}")
+        def _do_read():
+            # Open and read in one thread hop; a missing file surfaces as the
+            # open() error instead of costing a separate exists() stat
+            try:
+                with open(host_path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"File not found: {container_path}") from None
 
-        return await asyncio.to_thread(host_path.read_bytes)
+        return await _run_fs(_do_read)
 
     async def list_files(
         self, session_id: str, container_path: str = "/workspace"
@@ -77,60 +257,79 @@ class LocalStorage(WorkspaceStorage):
         """List files in a directory."""
         host_path = self._get_host_path(session_id, container_path)
 
-        if not await asyncio.to_thread(host_path.exists):
+        if not await _run_fs(os.path.exists, host_path):
             return []
 
         def _list_files():
+            # Walk with os.scandir so type and size come from the cached dirent
+            # info instead of a separate stat() call per entry. The order and
+            # symlink handling match Path.rglob("*"): each directory's entries,
+            # then its subdirectories depth-first; a symlink to a directory is
+            # listed as a directory but not descended into.
             files = []
-            for item in host_path.rglob("*"):
-                relative = item.relative_to(host_path)
-                container_item_path = f"{container_path.rstrip('/')}/{relative}"
-
-                is_dir = item.is_dir()
-                size = 0 if is_dir else item.stat().st_size
-
-                files.append(FileInfo(path=container_item_path, size=size, is_dir=is_dir))
+            stack = [(host_path, container_path.rstrip("/"))]
+            while stack:
+                host_dir, container_dir = stack.pop()
+                subdirs = []
+                with os.scandir(host_dir) as entries:
+                    for entry in entries:
+                        container_item_path = f"{container_dir}/{entry.name}"
+                        if entry.is_dir():
+                            files.append(FileInfo(path=container_item_path, size=0, is_dir=True))
+                            if not entry.is_symlink():
+                                subdirs.append((entry.path, container_item_path))
+                        else:
+                            files.append(
+                                FileInfo(path=container_item_path, size=entry.stat().st_size)
+                            )
+                stack.extend(reversed(subdirs))
             return files
 
-        return await asyncio.to_thread(_list_files)
+        return await _run_fs(_list_files)
 
     async def delete_file(self, session_id: str, container_path: str) -> bool:
         """Delete a file from the workspace."""
         try:
             host_path = self._get_host_path(session_id, container_path)
 
-            if await asyncio.to_thread(host_path.is_dir):
-                await asyncio.to_thread(shutil.rmtree, host_path)
-            else:
-                await asyncio.to_thread(host_path.unlink, missing_ok=True)
-
+            def _do_delete():
+                if os.path.isdir(host_path):
+                    shutil.rmtree(host_path)
+                else:
+                    try:
+                        os.unlink(host_path)
+                    except FileNotFoundError:
+                        pass
+
+            await _run_fs(_do_delete)
+            self._forget_dirs(host_path)
             return True
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+        except Exception:
+            logger.exception("Error deleting file")
             return False
 
     async def file_exists(self, session_id: str, container_path: str) -> bool:
         """Check if a file exists."""
         host_path = self._get_host_path(session_id, container_path)
-        return await asyncio.to_thread(host_path.exists)
+        return await _run_fs(os.path.exists, host_path)
 
     async def create_workspace(self, session_id: str) -> None:
         """Create a new workspace for a session."""
         workspace = self._get_workspace_path(session_id)
 
         def _create():
-            workspace.mkdir(parents=True, exist_ok=True)
-            (workspace / "project_files").mkdir(exist_ok=True)
-            (workspace / "out").mkdir(exist_ok=True)
+            os.makedirs(os.path.join(workspace, "project_files"), exist_ok=True)
+            os.makedirs(os.path.join(workspace, "out"), exist_ok=True)
 
-        await asyncio.to_thread(_create)
+        await _run_fs(_create)
 
     async def delete_workspace(self, session_id: str) -> None:
         """Delete entire workspace for a session."""
         workspace = self._get_workspace_path(session_id)
 
-        if await asyncio.to_thread(workspace.exists):
-            await asyncio.to_thread(shutil.rmtree, workspace)
+        if await _run_fs(os.path.exists, workspace):
+            await _run_fs(shutil.rmtree, workspace)
+        self._forget_dirs(workspace)
 
     async def copy_to_workspace(
         self, session_id: str, source_path: Path, dest_container_path: str
@@ -138,19 +337,37 @@ class LocalStorage(WorkspaceStorage):
         """Copy files from host to workspace."""
         dest_host_path = self._get_host_path(session_id, dest_container_path)
 
-        def _copy():
+        if _IS_WINDOWS and await _run_fs(source_path.is_dir):
+            await _run_fs(_robocopy_tree, str(source_path), dest_host_path)
+            return
+
+        def _prepare() -> List[Tuple[str, str]]:
             if source_path.is_file():
-                dest_host_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_path, dest_host_path)
+                dest_dirs = {os.path.dirname(dest_host_path)}
+                pairs = [(str(source_path), dest_host_path)]
             elif source_path.is_dir():
-                for file in source_path.rglob("*"):
-                    if file.is_file():
-                        relative_path = file.relative_to(source_path)
-                        dest_file = dest_host_path / relative_path
-                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(file, dest_file)
-
-        await asyncio.to_thread(_copy)
+                pairs, dest_dirs = _collect_copy_pairs(str(source_path), dest_host_path)
+            else:
+                return []
+
+            # Sorted order creates parents before children, so each makedirs
+            # call finds its ancestors already present; known dirs are skipped
+            for dest_dir in sorted(dest_dirs):
+                if not self._is_known_dir(dest_dir):
+                    os.makedirs(dest_dir, exist_ok=True)
+                    self._remember_dir(dest_dir)
+            return pairs
+
+        pairs = await _run_fs(_prepare)
+
+        # Fan the per-file copies out over the copy pool
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(_COPY_POOL, self._in_parent_dir, dst, _copy_file, src, dst)
+                for src, dst in pairs
+            )
+        )
 
     def get_volume_config(self, session_id: str) -> dict:
         """
@@ -162,5 +379,5 @@ class LocalStorage(WorkspaceStorage):
         Returns:
             Docker volume configuration dict
         """
-        workspace_path = self._get_workspace_path(session_id)
+        workspace_path = Path(self._get_workspace_path(session_id))
         return {str(workspace_path.absolute()): {"bind": "/workspace", "mode": "rw"}}
@@ -1,11 +1,18 @@
 """S3/MinIO storage backend for cloud deployment."""
 
 import asyncio
+import functools
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple
 
 try:
     import boto3
+    from boto3.s3.transfer import S3Transfer, TransferConfig
     from botocore.exceptions import ClientError
 
     BOTO3_AVAILABLE = True
@@ -14,6 +21,36 @@ except ImportError:
 
 from app.core.storage.workspace_storage import WorkspaceStorage, FileInfo
 
+logger = logging.getLogger(__name__)
+
+# Dedicated pool for S3 requests, sized for network-bound concurrency and kept
+# apart from the default executor so slow requests don't block other work
+_NET_POOL = ThreadPoolExecutor(max_workers=64, thread_name_prefix="s3")
+
+
+# Buckets already checked or created, keyed by (endpoint_url, bucket_name), so
+# new S3Storage instances skip the head_bucket round-trip
+_ENSURED_BUCKETS: set[Tuple[Optional[str], str]] = set()
+_ENSURED_BUCKETS_LOCK = threading.Lock()
+
+
+async def _run_net(func, /, *args, **kwargs):
+    """Run a blocking S3 call on the dedicated network pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_NET_POOL, functools.partial(func, *args, **kwargs))
+
+
+_WORKSPACE_PREFIX = "/workspace"
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_s3_key(session_id: str, container_path: str) -> str:
+    """Map a container path to its S3 object key, cached per input."""
+    # Remove leading '/workspace' from container path
+    relative_path = container_path.removeprefix(_WORKSPACE_PREFIX).lstrip("/")
+
+    return f"workspaces/{session_id}/{relative_path}"
+
 
 class S3Storage(WorkspaceStorage):
     """Storage backend using S3 or MinIO for cloud deployment."""
@@ -58,18 +95,35 @@ class S3Storage(WorkspaceStorage):
 
         self.s3_client = boto3.client("s3", **session_kwargs, **client_kwargs)
 
+        # Streaming, multipart-capable uploads
+        self._transfer = S3Transfer(
+            self.s3_client,
+            TransferConfig(
+                max_concurrency=32, multipart_threshold=8 * 1024 * 1024, use_threads=True
+            ),
+        )
+        self._object_transfer_config = TransferConfig(use_threads=True, max_concurrency=8)
+
         # Ensure bucket exists
         self._ensure_bucket()
 
     def _ensure_bucket(self):
-        """Ensure the S3 bucket exists."""
-        try:
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "404":
-                # Bucket doesn't exist, create it
-                self.s3_client.create_bucket(Bucket=self.bucket_name)
+        """Ensure the S3 bucket exists (checked once per process)."""
+        bucket_id = (self.endpoint_url, self.bucket_name)
+        if bucket_id in _ENSURED_BUCKETS:
+            return
+
+        with _ENSURED_BUCKETS_LOCK:
+            if bucket_id in _ENSURED_BUCKETS:
+                return
+            try:
+                self.s3_client.head_bucket(Bucket=self.bucket_name)
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                if error_code == "404":
+                    # Bucket doesn't exist, create it
+                    self.s3_client.create_bucket(Bucket=self.bucket_name)
+            _ENSURED_BUCKETS.add(bucket_id)
 
     def _get_s3_key(self, session_id: str, container_path: str) -> str:
         """
@@ -82,28 +136,37 @@ class S3Storage(WorkspaceStorage):
         Returns:
             S3 object key
         """
-        # Remove leading '/workspace' from container path
-        if container_path.startswith("/workspace/"):
-            relative_path = container_path[len("/workspace/") :]
-        elif container_path.startswith("/workspace"):
-            relative_path = container_path[len("/workspace") :]
-        else:
-            relative_path = container_path.lstrip("/")
-
-        return f"workspaces/{session_id}/{relative_path}"
-
-    async def write_file(self, session_id: str, container_path: str, content: bytes) -> bool:
-        """Write content to S3."""
+        return _compute_s3_key(session_id, container_path)
+
+    async def write_file(
+        self, session_id: str, container_path: str, content: bytes | BinaryIO
+    ) -> bool:
+        """Write content to S3.
+
+        Content may be bytes or a readable binary file object. Bytes below the
+        multipart threshold go up in a single put_object request; larger bytes and
+        file objects are uploaded in chunks (multipart for large files) by the
+        transfer manager.
+        """
         try:
             s3_key = self._get_s3_key(session_id, container_path)
+            is_bytes = isinstance(content, (bytes, bytearray))
 
             def _upload():
-                self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=content)
+                if is_bytes and len(content) < self._object_transfer_config.multipart_threshold:
+                    # A transfer manager and its threads cost more than the
+                    # upload itself for the typical small workspace file
+                    self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=content)
+                else:
+                    fileobj = io.BytesIO(content) if is_bytes else content
+                    self.s3_client.upload_fileobj(
+                        fileobj, self.bucket_name, s3_key, Config=self._object_transfer_config
+                    )
                 return True
 
-            return await asyncio.to_thread(_upload)
-        except Exception as e:
-            print(f"Error writing file to S3: {e}")
+            return await _run_net(_upload)
+        except Exception:
+            logger.exception("Error writing file to S3")
             return False
 
     async def read_file(self, session_id: str, container_path: str) -> bytes:
@@ -119,7 +182,36 @@ class S3Storage(WorkspaceStorage):
                     raise FileNotFoundError(f"File not found: {container_path}")
                 raise
 
-        return await asyncio.to_thread(_download)
+        return await _run_net(_download)
+
+    async def read_fileobj(self, session_id: str, container_path: str, fileobj: BinaryIO) -> None:
+        """
+        Stream a file from S3 into a writable binary file object.
+
+        Unlike read_file, the content is downloaded in chunks (in parallel for
+        large objects) and never held in memory as a whole unless fileobj does so.
+
+        Args:
+            session_id: Chat session ID
+            container_path: Path inside container
+            fileobj: Writable binary file object receiving the content
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        s3_key = self._get_s3_key(session_id, container_path)
+
+        def _download():
+            try:
+                self.s3_client.download_fileobj(
+                    self.bucket_name, s3_key, fileobj, Config=self._object_transfer_config
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                    raise FileNotFoundError(f"File not found: {container_path}")
+                raise
+
+        await _run_net(_download)
 
     async def list_files(
         self, session_id: str, container_path: str = "/workspace"
@@ -151,38 +243,25 @@ class S3Storage(WorkspaceStorage):
 
             return files
 
-        return await asyncio.to_thread(_list)
+        return await _run_net(_list)
 
     async def delete_file(self, session_id: str, container_path: str) -> bool:
         """Delete a file from S3."""
         try:
             s3_key = self._get_s3_key(session_id, container_path)
+            prefix = s3_key if s3_key.endswith("/") else s3_key + "/"
 
-            def _delete():
-                # Delete the object
+            def _delete_and_list() -> List[List[str]]:
+                # Delete the object, then list any objects under it as a
+                # directory, in the same executor hop
                 self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+                return self._list_key_pages(prefix)
 
-                # If it's a directory, delete all objects with this prefix
-                if not s3_key.endswith("/"):
-                    s3_key_prefix = s3_key + "/"
-                else:
-                    s3_key_prefix = s3_key
-
-                # List and delete all objects with this prefix
-                paginator = self.s3_client.get_paginator("list_objects_v2")
-                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=s3_key_prefix):
-                    if "Contents" in page:
-                        objects = [{"Key": obj["Key"]} for obj in page["Contents"]]
-                        if objects:
-                            self.s3_client.delete_objects(
-                                Bucket=self.bucket_name, Delete={"Objects": objects}
-                            )
-
-                return True
-
-            return await asyncio.to_thread(_delete)
-        except Exception as e:
-            print(f"Error deleting file from S3: {e}")
+            pages = await _run_net(_delete_and_list)
+            await self._delete_key_pages(pages)
+            return True
+        except Exception:
+            logger.exception("Error deleting file from S3")
             return False
 
     async def file_exists(self, session_id: str, container_path: str) -> bool:
@@ -198,7 +277,7 @@ class S3Storage(WorkspaceStorage):
                     return False
                 raise
 
-        return await asyncio.to_thread(_exists)
+        return await _run_net(_exists)
 
     async def create_workspace(self, session_id: str) -> None:
         """Create workspace structure in S3 (create placeholder objects for directories)."""
@@ -209,49 +288,78 @@ class S3Storage(WorkspaceStorage):
                 s3_key = f"workspaces/{session_id}/{subdir}/.keep"
                 self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=b"")
 
-        await asyncio.to_thread(_create)
+        await _run_net(_create)
 
     async def delete_workspace(self, session_id: str) -> None:
         """Delete all objects in the workspace."""
+        await self._delete_prefix(f"workspaces/{session_id}/")
+
+    async def _delete_prefix(self, prefix: str) -> None:
+        """Delete every object under a key prefix."""
+        pages = await _run_net(self._list_key_pages, prefix)
+        await self._delete_key_pages(pages)
+
+    def _list_key_pages(self, prefix: str) -> List[List[str]]:
+        """List object keys under a prefix, one list per page of up to 1000 keys."""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return [
+            [obj["Key"] for obj in page["Contents"]]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+            if page.get("Contents")
+        ]
+
+    async def _delete_key_pages(self, pages: List[List[str]]) -> None:
+        """Delete pages of keys, one concurrent delete_objects request per page.
+
+        Listing is sequential (pagination tokens chain), so only the deletes
+        fan out.
+        """
 
-        def _delete():
-            prefix = f"workspaces/{session_id}/"
-
-            # List and delete all objects
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
-                if "Contents" in page:
-                    objects = [{"Key": obj["Key"]} for obj in page["Contents"]]
-                    if objects:
-                        self.s3_client.delete_objects(
-                            Bucket=self.bucket_name, Delete={"Objects": objects}
-                        )
+        def _delete_page(keys: List[str]) -> None:
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
 
-        await asyncio.to_thread(_delete)
+        await asyncio.gather(*(_run_net(_delete_page, keys) for keys in pages))
 
     async def copy_to_workspace(
         self, session_id: str, source_path: Path, dest_container_path: str
     ) -> None:
         """Copy files from host to S3."""
 
-        def _copy():
+        def _collect() -> List[Tuple[str, str]]:
             if source_path.is_file():
-                s3_key = self._get_s3_key(session_id, dest_container_path)
-                with open(source_path, "rb") as f:
-                    self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=f.read())
-            elif source_path.is_dir():
-                for file in source_path.rglob("*"):
-                    if file.is_file():
-                        relative_path = file.relative_to(source_path)
-                        container_file_path = f"{dest_container_path.rstrip('/')}/{relative_path}"
-                        s3_key = self._get_s3_key(session_id, container_file_path)
-
-                        with open(file, "rb") as f:
-                            self.s3_client.put_object(
-                                Bucket=self.bucket_name, Key=s3_key, Body=f.read()
-                            )
-
-        await asyncio.to_thread(_copy)
+                return [(str(source_path), self._get_s3_key(session_id, dest_container_path))]
+            if not source_path.is_dir():
+                return []
+
+            pairs = []
+            dest_prefix = dest_container_path.rstrip("/")
+            for root, _, filenames in os.walk(source_path):
+                relative_root = os.path.relpath(root, source_path).replace(os.sep, "/")
+                for filename in filenames:
+                    relative_path = (
+                        filename if relative_root == "." else f"{relative_root}/{filename}"
+                    )
+                    container_file_path = f"{dest_prefix}/{relative_path}"
+                    pairs.append(
+                        (
+                            os.path.join(root, filename),
+                            self._get_s3_key(session_id, container_file_path),
+                        )
+                    )
+            return pairs
+
+        pairs = await _run_net(_collect)
+
+        # Upload concurrently; upload_file streams from disk instead of reading into memory
+        await asyncio.gather(
+            *(
+                _run_net(self._transfer.upload_file, local_path, self.bucket_name, key)
+                for local_path, key in pairs
+            )
+        )
 
     def get_volume_config(self, session_id: str) -> dict:
         """
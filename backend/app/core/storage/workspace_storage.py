@@ -1,17 +1,18 @@
 """Workspace storage abstraction for different storage backends."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import List
 from pathlib import Path
 
 
+@dataclass(slots=True, frozen=True)
 class FileInfo:
     """File metadata."""
 
-    def __init__(self, path: str, size: int, is_dir: bool = False):
-        self.path = path
-        self.size = size
-        self.is_dir = is_dir
+    path: str
+    size: int
+    is_dir: bool = False
 
 
 class WorkspaceStorage(ABC):
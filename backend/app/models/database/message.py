@@ -24,7 +24,7 @@ class Message(Base):
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     chat_session_id = Column(
-        String(36), ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False
+        String(36), ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False, index=True
     )
     role = Column(Enum(MessageRole), nullable=False)
     content = Column(Text, nullable=False)
@@ -1,7 +1,7 @@
 """Agent configuration schemas for API validation."""
 
 from typing import Dict, List, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AgentConfigurationBase(BaseModel):
@@ -36,5 +36,4 @@ class AgentConfigurationResponse(AgentConfigurationBase):
     id: str
     project_id: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
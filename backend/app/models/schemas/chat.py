@@ -1,7 +1,7 @@
 """Chat session schemas for API validation."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.database.chat_session import ChatSessionStatus
 
@@ -38,8 +38,7 @@ class ChatSessionResponse(ChatSessionBase):
         None, description="Environment type if set up (python3.11, nodejs, etc.)"
     )
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ChatSessionListResponse(BaseModel):
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.database.content_block import ContentBlockType, ContentBlockAuthor
 
@@ -43,8 +43,7 @@ class ContentBlockResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ContentBlockListResponse(BaseModel):
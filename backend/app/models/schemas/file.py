@@ -1,7 +1,7 @@
 """File schemas for API validation."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.database.file import FileType
 
@@ -24,8 +24,7 @@ class FileResponse(FileBase):
     uploaded_at: datetime
     hash: str | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class FileListResponse(BaseModel):
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Dict, Any, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.database.message import MessageRole
 from app.models.database.agent_action import AgentActionStatus
@@ -32,8 +32,7 @@ class AgentActionResponse(BaseModel):
     action_metadata: Dict[str, Any] | None = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class MessageResponse(BaseModel):
@@ -47,8 +46,7 @@ class MessageResponse(BaseModel):
     created_at: datetime
     agent_actions: List[AgentActionResponse] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class MessageListResponse(BaseModel):
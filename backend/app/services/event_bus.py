@@ -5,14 +5,27 @@ without tight coupling to the business logic.
 """
 
 from enum import Enum
-from typing import Dict, List, Callable, Any, Optional
+from typing import Deque, Dict, FrozenSet, List, Callable, Any, Optional, Tuple, Union
 import asyncio
 import logging
-from dataclasses import dataclass
-from datetime import datetime
+from bisect import insort
+from collections import defaultdict, deque
+from contextvars import Context, ContextVar
+from itertools import islice
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# (bus, event) pairs the current task is dispatching. Context-local so that
+# only a nested emit from inside a handler counts as reentrant, not an emit of
+# the same event from another coroutine sharing the bus.
+_emitting: ContextVar[FrozenSet[Tuple["EventBus", "StreamingEvent"]]] = ContextVar(
+    "event_bus_emitting", default=frozenset()
+)
+
 
 class StreamingEvent(Enum):
     """Enumeration of all streaming-related events."""
@@ -41,18 +54,47 @@ class StreamingEvent(Enum):
     OBSERVATION = "action.observation"
 
 
-@dataclass
+def _json_default(obj: Any) -> str:
+    """Encode datetimes in payloads as ISO 8601, anything else via str()."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+@dataclass(slots=True)
 class EventData:
     """Container for event data."""
 
     event_type: StreamingEvent
-    payload: Dict[str, Any]
-    timestamp: datetime = None
+    payload: Optional[Dict[str, Any]]
+    timestamp: int = None  # nanoseconds since the epoch
     source: Optional[str] = None
+    _encoded: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
+            self.timestamp = time.time_ns()
+
+    @property
+    def iso_timestamp(self) -> str:
+        """The event time as an ISO 8601 UTC string, for when it leaves the process."""
+        return datetime.fromtimestamp(self.timestamp / 1e9, tz=timezone.utc).isoformat()
+
+    @property
+    def encoded(self) -> bytes:
+        """JSON wire encoding of the event, computed once and shared by all subscribers."""
+        if self._encoded is None:
+            self._encoded = json.dumps(
+                {"type": self.event_type.value, "data": self.payload},
+                separators=(",", ":"),
+                default=_json_default,
+            ).encode()
+        return self._encoded
+
+
+def _neg_priority(subscriber: tuple) -> int:
+    """Sort key keeping subscriber lists in descending priority order."""
+    return -subscriber[0]
 
 
 class EventBus:
@@ -64,14 +106,32 @@ class EventBus:
     def __init__(self):
         """Initialize the event bus."""
         self._subscribers: Dict[StreamingEvent, List[Callable]] = {}
+        self._total_subscribers = 0
         self._event_queue: asyncio.Queue = asyncio.Queue()
-        self._processing = False
-        self._event_history: List[EventData] = []
+        # Long-lived worker draining the queue, started on first queued event
+        self._dispatcher_task: Optional[asyncio.Task] = None
+        # One shared future per event for wait_for_event callers, resolved
+        # and replaced the next time the event fires
+        self._waiters: Dict[StreamingEvent, asyncio.Future] = {}
+        # Callers currently awaiting each shared future, so the last one to
+        # time out can drop it and has_subscribers() stops reporting it
+        self._waiter_counts: Dict[asyncio.Future, int] = {}
         self._max_history_size = 1000
+        self._event_history: Deque[EventData] = deque(maxlen=self._max_history_size)
+        # Per-type history so filtered lookups don't scan every event
+        self._history_by_type: Dict[StreamingEvent, Deque[EventData]] = defaultdict(
+            lambda: deque(maxlen=self._max_history_size)
+        )
 
         logger.info("EventBus initialized")
 
-    def subscribe(self, event: StreamingEvent, handler: Callable, priority: int = 0) -> None:
+    def subscribe(
+        self,
+        event: StreamingEvent,
+        handler: Callable,
+        priority: int = 0,
+        with_event: bool = False,
+    ) -> None:
         """
         Subscribe to an event.
 
@@ -79,15 +139,24 @@ class EventBus:
             event: The event type to subscribe to
             handler: The callback function to execute
             priority: Handler priority (higher executes first)
+            with_event: Pass the handler the EventData instead of its payload,
+                e.g. so websocket fan-out can send the shared ``encoded`` bytes
         """
         if event not in self._subscribers:
             self._subscribers[event] = []
 
-        # Insert handler based on priority
-        self._subscribers[event].append((priority, handler))
-        self._subscribers[event].sort(key=lambda x: x[0], reverse=True)
+        # Insert handler in descending priority order, after any handlers of
+        # equal priority (same order the previous stable sort produced).
+        # Whether it is a coroutine function is resolved once here instead of
+        # on every dispatch.
+        insort(
+            self._subscribers[event],
+            (priority, handler, asyncio.iscoroutinefunction(handler), with_event),
+            key=_neg_priority,
+        )
+        self._total_subscribers += 1
 
-        logger.debug(f"Subscribed handler {handler.__name__} to event {event.value}")
+        logger.debug("Subscribed handler %s to event %s", handler.__name__, event.value)
 
     def unsubscribe(self, event: StreamingEvent, handler: Callable) -> None:
         """
@@ -98,66 +167,157 @@ class EventBus:
             handler: The callback function to remove
         """
         if event in self._subscribers:
-            self._subscribers[event] = [(p, h) for p, h in self._subscribers[event] if h != handler]
-            logger.debug(f"Unsubscribed handler {handler.__name__} from event {event.value}")
+            remaining = [sub for sub in self._subscribers[event] if sub[1] != handler]
+            self._total_subscribers -= len(self._subscribers[event]) - len(remaining)
+            self._subscribers[event] = remaining
+            logger.debug("Unsubscribed handler %s from event %s", handler.__name__, event.value)
 
-    async def emit(self, event: StreamingEvent, data: Any, source: Optional[str] = None) -> None:
+    def has_subscribers(self, event: StreamingEvent) -> bool:
+        """
+        Check whether anything is listening for an event.
+
+        Args:
+            event: The event type to check
+
+        Returns:
+            True if the event has subscribers or pending wait_for_event callers
+        """
+        return bool(self._subscribers.get(event)) or event in self._waiters
+
+    async def emit(
+        self,
+        event: StreamingEvent,
+        payload: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+        source: Optional[str] = None,
+    ) -> None:
         """
         Emit an event to all subscribers.
 
         Args:
             event: The event type to emit
-            data: The event data/payload
+            payload: The event payload dict, passed to handlers as-is (callers
+                wrap non-dict values themselves). A zero-argument callable is
+                treated as a payload factory and only invoked when something is
+                listening; otherwise the event is recorded in history with a
+                None payload.
             source: Optional source identifier
         """
-        event_data = EventData(
-            event_type=event,
-            payload=data if isinstance(data, dict) else {"data": data},
-            source=source,
-        )
+        if callable(payload):
+            payload = payload() if self.has_subscribers(event) else None
+
+        event_data = EventData(event_type=event, payload=payload, source=source)
 
         # Add to history
         self._add_to_history(event_data)
 
-        # Add to queue
-        await self._event_queue.put(event_data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Emitted event %s", event.value)
 
-        logger.debug(f"Emitted event {event.value} with payload size {len(str(data))}")
+        handlers = self._subscribers.get(event)
+        if not handlers:
+            self._notify_waiters(event_data)
+            return
 
-        # Start processing if not already running
-        if not self._processing:
-            asyncio.create_task(self._process_events())
+        emitting = _emitting.get()
+        if (self, event) in emitting:
+            # Reentrant emit from one of this event's handlers: queue it so
+            # it runs after the current dispatch
+            self._ensure_dispatcher()
+            await self._event_queue.put(event_data)
+            return
 
-    async def _process_events(self):
-        """Process queued events asynchronously."""
-        self._processing = True
+        # Dispatch inline, without a queue round-trip or a task switch
+        token = _emitting.set(emitting | {(self, event)})
+        try:
+            await self._dispatch(event_data, handlers)
+        finally:
+            _emitting.reset(token)
 
+        self._notify_waiters(event_data)
+
+    async def _dispatch(self, event_data: EventData, handlers: List) -> None:
+        """
+        Run every handler for an event, isolating handler errors.
+
+        Args:
+            event_data: The event being dispatched
+            handlers: The (priority, handler, is_coro, with_event) entries subscribed
+                to the event
+        """
+        event = event_data.event_type
+        for priority, handler, is_coro, with_event in handlers:
+            try:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Executing handler %s for event %s", handler.__name__, event.value)
+
+                arg = event_data if with_event else event_data.payload
+                if is_coro:
+                    await handler(arg)
+                else:
+                    handler(arg)
+
+            except Exception as e:
+                logger.error(
+                    f"Error in event handler {handler.__name__} for event {event.value}: {e}",
+                    exc_info=True,
+                )
+
+    def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher task if it isn't running on the current loop."""
+        loop = asyncio.get_running_loop()
+        task = self._dispatcher_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+
+        if task is not None and task.get_loop() is not loop:
+            # The old loop is gone along with anything queued on it
+            self._event_queue = asyncio.Queue()
+        # Start from an empty context: a task copies the current one, and the
+        # (bus, event) entry of the handler that started it would otherwise make
+        # every later emit of that event from the dispatcher look reentrant
+        self._dispatcher_task = loop.create_task(self._dispatcher(), context=Context())
+
+    async def _dispatcher(self) -> None:
+        """Dispatch queued (reentrant) events in order until cancelled."""
+        while True:
+            event_data = await self._event_queue.get()
+            try:
+                handlers = self._subscribers.get(event_data.event_type)
+                if handlers:
+                    token = _emitting.set(_emitting.get() | {(self, event_data.event_type)})
+                    try:
+                        await self._dispatch(event_data, handlers)
+                    finally:
+                        _emitting.reset(token)
+                self._notify_waiters(event_data)
+            finally:
+                self._event_queue.task_done()
+
+    async def aclose(self) -> None:
+        """Dispatch any queued events, then stop the dispatcher task."""
+        task = self._dispatcher_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._dispatcher_task = None
+            return
+
+        await self._event_queue.join()
+        task.cancel()
         try:
-            while not self._event_queue.empty():
-                event_data = await self._event_queue.get()
-                event = event_data.event_type
-
-                if event in self._subscribers:
-                    for priority, handler in self._subscribers[event]:
-                        try:
-                            logger.debug(
-                                f"Executing handler {handler.__name__} for event {event.value}"
-                            )
-
-                            if asyncio.iscoroutinefunction(handler):
-                                await handler(event_data.payload)
-                            else:
-                                handler(event_data.payload)
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error in event handler {handler.__name__} "
-                                f"for event {event.value}: {e}",
-                                exc_info=True,
-                            )
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher_task = None
 
-        finally:
-            self._processing = False
+    def _notify_waiters(self, event_data: EventData) -> None:
+        """
+        Wake every wait_for_event caller waiting on this event.
+
+        Args:
+            event_data: The event that fired
+        """
+        waiter = self._waiters.pop(event_data.event_type, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(event_data)
 
     def _add_to_history(self, event_data: EventData) -> None:
         """
@@ -166,11 +326,9 @@ class EventBus:
         Args:
             event_data: The event data to store
         """
+        # The deque's maxlen evicts the oldest event once history is full
         self._event_history.append(event_data)
-
-        # Trim history if it exceeds max size
-        if len(self._event_history) > self._max_history_size:
-            self._event_history = self._event_history[-self._max_history_size :]
+        self._history_by_type[event_data.event_type].append(event_data)
 
     def get_history(
         self, event_type: Optional[StreamingEvent] = None, limit: int = 100
@@ -185,16 +343,17 @@ class EventBus:
         Returns:
             List of historical events
         """
-        history = self._event_history
-
         if event_type:
-            history = [e for e in history if e.event_type == event_type]
+            history = self._history_by_type.get(event_type, ())
+        else:
+            history = self._event_history
 
-        return history[-limit:]
+        return list(islice(history, max(0, len(history) - limit), None))
 
     def clear_history(self) -> None:
         """Clear the event history."""
         self._event_history.clear()
+        self._history_by_type.clear()
         logger.info("Event history cleared")
 
     def get_subscriber_count(self, event: Optional[StreamingEvent] = None) -> int:
@@ -210,7 +369,7 @@ class EventBus:
         if event:
             return len(self._subscribers.get(event, []))
         else:
-            return sum(len(handlers) for handlers in self._subscribers.values())
+            return self._total_subscribers
 
     async def wait_for_event(
         self, event: StreamingEvent, timeout: Optional[float] = None
@@ -225,33 +384,45 @@ class EventBus:
         Returns:
             The event data if received, None if timeout
         """
-        future = asyncio.Future()
-
-        def handler(data):
-            if not future.done():
-                future.set_result(EventData(event_type=event, payload=data))
-
-        self.subscribe(event, handler)
+        future = self._waiters.get(event)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[event] = future
 
+        self._waiter_counts[future] = self._waiter_counts.get(future, 0) + 1
         try:
-            result = await asyncio.wait_for(future, timeout=timeout)
-            return result
+            # Shield the shared future so one waiter timing out doesn't
+            # cancel it for the others
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
         except asyncio.TimeoutError:
             logger.warning(f"Timeout waiting for event {event.value}")
             return None
         finally:
-            self.unsubscribe(event, handler)
+            remaining = self._waiter_counts.pop(future, 1) - 1
+            if remaining:
+                self._waiter_counts[future] = remaining
+            elif self._waiters.get(event) is future:
+                del self._waiters[event]
 
     def reset(self) -> None:
         """Reset the event bus to initial state."""
         self._subscribers.clear()
+        self._total_subscribers = 0
         self._event_history.clear()
-        self._processing = False
+        self._history_by_type.clear()
+        self._waiters.clear()
+        self._waiter_counts.clear()
+
+        task = self._dispatcher_task
+        if task is not None and not task.get_loop().is_closed():
+            task.cancel()
+        self._dispatcher_task = None
 
         # Clear the queue
         while not self._event_queue.empty():
             try:
                 self._event_queue.get_nowait()
+                self._event_queue.task_done()
             except asyncio.QueueEmpty:
                 break
 
@@ -3,10 +3,12 @@ Message Orchestrator - coordinates between streaming, persistence, and events.
 This is the main controller that manages the complete message lifecycle.
 """
 
-from typing import Optional, Dict
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping, Set
 import logging
+from collections import defaultdict
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.services.message_persistence import MessagePersistenceService, PersistenceError
 from app.services.streaming_buffer import StreamingBuffer
@@ -14,6 +16,20 @@ from app.services.event_bus import EventBus, StreamingEvent
 
 logger = logging.getLogger(__name__)
 
+# Formatted timestamp shared by events emitted within the same ~1ms window
+_ts_key = -1
+_ts_value = ""
+
+
+def _iso_now() -> str:
+    """Return the current UTC time in ISO format, reusing it for bursts of events."""
+    global _ts_key, _ts_value
+    key = time.monotonic_ns() >> 20
+    if key != _ts_key:
+        _ts_value = datetime.now(timezone.utc).isoformat()
+        _ts_key = key
+    return _ts_value
+
 
 class MessageOrchestrator:
     """
@@ -36,6 +52,9 @@ class MessageOrchestrator:
         self.buffer = buffer
         self.event_bus = event_bus
         self._active_streams: Dict[str, str] = {}  # message_id -> session_id
+        # Reverse index (session_id -> message_ids) for per-session lookups
+        self._streams_by_session: Dict[str, Set[str]] = defaultdict(set)
+        self._active_streams_view = MappingProxyType(self._active_streams)
 
         logger.info("MessageOrchestrator initialized")
 
@@ -62,6 +81,7 @@ class MessageOrchestrator:
 
             # 3. Track active stream
             self._active_streams[message_id] = session_id
+            self._streams_by_session[session_id].add(message_id)
 
             # 4. Emit event for WebSocket
             await self.event_bus.emit(
@@ -70,11 +90,11 @@ class MessageOrchestrator:
                     "message_id": message_id,
                     "session_id": session_id,
                     "role": role,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
 
-            logger.info(f"Started streaming for message {message_id} in session {session_id}")
+            logger.info("Started streaming for message %s in session %s", message_id, session_id)
             return message_id
 
         except Exception as e:
@@ -99,11 +119,14 @@ class MessageOrchestrator:
                 {
                     "message_id": message_id,
                     "content": chunk,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
 
-            logger.debug(f"Processed chunk for message {message_id}: {len(chunk)} characters")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Processed chunk for message %s: %d characters", message_id, len(chunk)
+                )
 
         except ValueError as e:
             logger.error(f"Failed to process chunk: {e}")
@@ -130,25 +153,26 @@ class MessageOrchestrator:
             step: Step number in the action sequence
         """
         if status == "streaming":
+            # Payloads are built lazily so unobserved events cost no dict
             await self.event_bus.emit(
                 StreamingEvent.ACTION_STREAMING,
-                {
+                lambda: {
                     "message_id": message_id,
                     "tool": tool,
                     "status": status,
                     "step": step,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
         elif status == "complete":
             await self.event_bus.emit(
                 StreamingEvent.ACTION_COMPLETE,
-                {
+                lambda: {
                     "message_id": message_id,
                     "tool": tool,
                     "args": args,
                     "step": step,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
 
@@ -172,13 +196,13 @@ class MessageOrchestrator:
         """
         await self.event_bus.emit(
             StreamingEvent.OBSERVATION,
-            {
+            lambda: {
                 "message_id": message_id,
                 "content": content,
                 "success": success,
                 "metadata": metadata,
                 "step": step,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _iso_now(),
             },
         )
 
@@ -218,22 +242,13 @@ class MessageOrchestrator:
             if not success:
                 raise PersistenceError("Failed to save complete message")
 
-            # 5. Verify persistence (read back from DB)
-            saved_message = await self.persistence.get_message(message_id)
-            if saved_message and len(saved_message.content) != len(complete_content):
-                logger.error(
-                    f"Persistence verification failed for message {message_id}: "
-                    f"Expected {len(complete_content)}, got {len(saved_message.content)}"
-                )
-                raise PersistenceError("Content length mismatch after save")
-
-            # 6. Cleanup buffer only after successful persistence
+            # 5. Cleanup buffer only after successful persistence
             self.buffer.cleanup(message_id)
 
-            # 7. Remove from active streams
-            self._active_streams.pop(message_id, None)
+            # 6. Remove from active streams
+            self._forget_stream(message_id)
 
-            # 8. Emit success events
+            # 7. Emit success events
             await self.event_bus.emit(
                 StreamingEvent.PERSIST_SUCCESS,
                 {
@@ -249,13 +264,14 @@ class MessageOrchestrator:
                     "message_id": message_id,
                     "success": True,
                     "content_length": len(complete_content),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
 
             logger.info(
-                f"Successfully completed streaming for message {message_id}: "
-                f"{len(complete_content)} characters persisted"
+                "Successfully completed streaming for message %s: %d characters persisted",
+                message_id,
+                len(complete_content),
             )
             return True
 
@@ -275,7 +291,7 @@ class MessageOrchestrator:
                 {
                     "message_id": message_id,
                     "error": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _iso_now(),
                 },
             )
 
@@ -292,24 +308,23 @@ class MessageOrchestrator:
             Resume information if active stream found
         """
         # Find active stream for session
-        for message_id, sid in self._active_streams.items():
-            if sid == session_id:
-                metadata = self.buffer.get_metadata(message_id)
-                if metadata and metadata.is_streaming:
-                    resume_info = {
-                        "message_id": message_id,
-                        "chunk_count": metadata.chunk_count,
-                        "total_bytes": metadata.total_bytes,
-                        "is_streaming": metadata.is_streaming,
-                    }
-
-                    # Emit resume event
-                    await self.event_bus.emit(StreamingEvent.RESUME, resume_info)
-
-                    logger.info(f"Resuming stream for session {session_id}: {resume_info}")
-                    return resume_info
-
-        logger.info(f"No active stream found for session {session_id}")
+        for message_id in self._streams_by_session.get(session_id, ()):
+            metadata = self.buffer.get_metadata(message_id)
+            if metadata and metadata.is_streaming:
+                resume_info = {
+                    "message_id": message_id,
+                    "chunk_count": metadata.chunk_count,
+                    "total_bytes": metadata.total_bytes,
+                    "is_streaming": metadata.is_streaming,
+                }
+
+                # Emit resume event
+                await self.event_bus.emit(StreamingEvent.RESUME, resume_info)
+
+                logger.info("Resuming stream for session %s: %s", session_id, resume_info)
+                return resume_info
+
+        logger.info("No active stream found for session %s", session_id)
         return None
 
     async def cancel_streaming(self, message_id: str) -> bool:
@@ -329,14 +344,26 @@ class MessageOrchestrator:
         # Complete with cancelled flag
         return await self.complete_streaming(message_id, cancelled=True)
 
-    def get_active_streams(self) -> Dict[str, str]:
+    def _forget_stream(self, message_id: str) -> None:
+        """Remove a message from the active stream index."""
+        session_id = self._active_streams.pop(message_id, None)
+        if session_id is None:
+            return
+
+        session_streams = self._streams_by_session.get(session_id)
+        if session_streams is not None:
+            session_streams.discard(message_id)
+            if not session_streams:
+                del self._streams_by_session[session_id]
+
+    def get_active_streams(self) -> Mapping[str, str]:
         """
         Get all active streaming sessions.
 
         Returns:
-            Dictionary of message_id -> session_id
+            Read-only live view of message_id -> session_id
         """
-        return self._active_streams.copy()
+        return self._active_streams_view
 
     def is_streaming(self, message_id: str) -> bool:
         """
@@ -397,17 +424,18 @@ class MessageOrchestrator:
         cleaned = 0
 
         # Find and cancel active streams for this session
-        for message_id, sid in list(self._active_streams.items()):
-            if sid == session_id:
-                await self.cancel_streaming(message_id)
-                cleaned += 1
+        for message_id in list(self._streams_by_session.get(session_id, ())):
+            await self.cancel_streaming(message_id)
+            cleaned += 1
 
         # Delete incomplete messages from DB
         deleted = await self.persistence.delete_incomplete_messages(session_id)
 
         logger.info(
-            f"Cleaned up {cleaned} active streams and "
-            f"{deleted} incomplete messages for session {session_id}"
+            "Cleaned up %d active streams and %d incomplete messages for session %s",
+            cleaned,
+            deleted,
+            session_id,
         )
 
         return cleaned + deleted
@@ -3,17 +3,17 @@ Message Persistence Service - handles all database operations for messages.
 This service ensures atomic persistence of complete message content.
 """
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
 
-from app.models.database import Message
+from app.models.database import AgentAction, Message
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,7 @@ class MessagePersistenceService:
             self.db.add(message)
             await self.db.flush()  # Get ID without committing
 
-            logger.info(f"Created message {message.id} for session {session_id}")
+            logger.info("Created message %s for session %s", message.id, session_id)
             return message.id
 
         except IntegrityError as e:
@@ -81,40 +81,35 @@ class MessagePersistenceService:
         Returns True if successful, False otherwise.
         """
         try:
-            # Get the message from database
-            result = await self.db.execute(select(Message).where(Message.id == message_id))
-            message = result.scalar_one_or_none()
-
-            if not message:
-                raise ValueError(f"Message {message_id} not found")
-
             # Log before saving
             logger.info(
-                f"Saving complete content for message {message_id}: {len(final_content)} characters"
+                "Saving complete content for message %s: %d characters",
+                message_id,
+                len(final_content),
             )
 
-            # Save complete content
-            message.content = final_content
+            # Save complete content in a single UPDATE
+            values = {"content": final_content}
             if metadata:
-                message.message_metadata.update(metadata)
-            message.is_complete = True  # Mark as complete
-            message.updated_at = datetime.utcnow()
+                # Merge needs the stored metadata, so read just that column
+                stored = await self.db.scalar(
+                    select(Message.message_metadata).where(Message.id == message_id)
+                )
+                values["message_metadata"] = {**(stored or {}), **metadata}
+
+            result = await self.db.execute(
+                update(Message).where(Message.id == message_id).values(**values)
+            )
+            if result.rowcount == 0:
+                raise ValueError(f"Message {message_id} not found")
 
             # Atomic commit
             await self.db.commit()
 
-            # Verify persistence by refreshing from DB
-            await self.db.refresh(message)
-
-            # Verification check
-            if len(message.content) != len(final_content):
-                raise PersistenceError(
-                    f"Content mismatch after save: expected {len(final_content)}, "
-                    f"got {len(message.content)}"
-                )
-
             logger.info(
-                f"Successfully persisted message {message_id} with {len(message.content)} characters"
+                "Successfully persisted message %s with %d characters",
+                message_id,
+                len(final_content),
             )
             return True
 
@@ -123,6 +118,49 @@ class MessagePersistenceService:
             await self.db.rollback()
             raise PersistenceError(f"Failed to persist message: {e}")
 
+    async def save_complete_messages(
+        self, items: Iterable[Tuple[str, str, Optional[dict]]]
+    ) -> Set[str]:
+        """
+        Save several complete messages in a single transaction.
+        Returns the IDs of the messages that were found and saved.
+        """
+        items = list(items)
+        try:
+            # Merges need the stored metadata, so read it for all messages at once
+            merge_ids = [message_id for message_id, _, metadata in items if metadata]
+            stored = {}
+            if merge_ids:
+                rows = await self.db.execute(
+                    select(Message.id, Message.message_metadata).where(Message.id.in_(merge_ids))
+                )
+                stored = dict(rows.all())
+
+            saved = set()
+            for message_id, final_content, metadata in items:
+                values = {"content": final_content}
+                if metadata:
+                    values["message_metadata"] = {**(stored.get(message_id) or {}), **metadata}
+
+                result = await self.db.execute(
+                    update(Message).where(Message.id == message_id).values(**values)
+                )
+                if result.rowcount == 0:
+                    logger.error(f"Message {message_id} not found")
+                    continue
+                saved.add(message_id)
+
+            # One commit for the whole batch
+            await self.db.commit()
+
+            logger.info("Persisted %d of %d complete messages", len(saved), len(items))
+            return saved
+
+        except Exception as e:
+            logger.error(f"Failed to persist message batch: {e}")
+            await self.db.rollback()
+            raise PersistenceError(f"Failed to persist messages: {e}")
+
     async def update_message_content(
         self, message_id: str, content: str, is_partial: bool = True
     ) -> bool:
@@ -130,23 +168,22 @@ class MessagePersistenceService:
         Update message content (used during streaming for partial updates).
         """
         try:
-            result = await self.db.execute(select(Message).where(Message.id == message_id))
-            message = result.scalar_one_or_none()
+            # Don't commit here - let the caller decide when to commit
+            result = await self.db.execute(
+                update(Message).where(Message.id == message_id).values(content=content)
+            )
 
-            if not message:
+            if result.rowcount == 0:
                 logger.error(f"Message {message_id} not found for update")
                 return False
 
-            message.content = content
-            message.is_complete = not is_partial
-            message.updated_at = datetime.utcnow()
-
-            # Don't commit here - let the caller decide when to commit
-            await self.db.flush()
-
-            logger.debug(
-                f"Updated message {message_id} with {len(content)} characters (partial={is_partial})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Updated message %s with %d characters (partial=%s)",
+                    message_id,
+                    len(content),
+                    is_partial,
+                )
             return True
 
         except Exception as e:
@@ -156,15 +193,17 @@ class MessagePersistenceService:
     async def mark_message_incomplete(self, message_id: str):
         """Mark a message as incomplete (for error cases)."""
         try:
-            result = await self.db.execute(select(Message).where(Message.id == message_id))
-            message = result.scalar_one_or_none()
+            result = await self.db.execute(
+                select(Message.message_metadata).where(Message.id == message_id)
+            )
+            row = result.one_or_none()
 
-            if message:
-                message.is_complete = False
-                if not message.message_metadata:
-                    message.message_metadata = {}
-                message.message_metadata["error"] = "Streaming interrupted"
-                message.updated_at = datetime.utcnow()
+            if row:
+                await self.db.execute(
+                    update(Message)
+                    .where(Message.id == message_id)
+                    .values(message_metadata={**(row[0] or {}), "error": "Streaming interrupted"})
+                )
 
                 await self.db.commit()
                 logger.warning(f"Marked message {message_id} as incomplete")
@@ -209,21 +248,22 @@ class MessagePersistenceService:
         Returns the number of messages deleted.
         """
         try:
-            result = await self.db.execute(
-                select(Message).where(
-                    Message.chat_session_id == session_id, Message.is_complete.is_(False)
+            incomplete = (Message.chat_session_id == session_id, Message.is_complete.is_(False))
+
+            # Delete child actions explicitly; SQLite only enforces ON DELETE
+            # CASCADE when foreign keys are enabled
+            await self.db.execute(
+                delete(AgentAction).where(
+                    AgentAction.message_id.in_(select(Message.id).where(*incomplete))
                 )
             )
-            incomplete_messages = result.scalars().all()
-
-            count = len(incomplete_messages)
-            for msg in incomplete_messages:
-                await self.db.delete(msg)
+            result = await self.db.execute(delete(Message).where(*incomplete).returning(Message.id))
+            count = len(result.fetchall())
 
             await self.db.commit()
 
             if count > 0:
-                logger.info(f"Deleted {count} incomplete messages from session {session_id}")
+                logger.info("Deleted %d incomplete messages from session %s", count, session_id)
 
             return count
 
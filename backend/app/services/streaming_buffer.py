@@ -3,14 +3,25 @@ Streaming Buffer - manages in-memory content during streaming.
 This service handles chunk accumulation without any database operations.
 """
 
-from collections import defaultdict
-from typing import Dict, List, Optional
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+import threading
 import time
 import logging
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# surrogatepass keeps any str round-trippable through the UTF-8 byte buffer
+_ENCODING = "utf-8"
+_ERRORS = "surrogatepass"
+
+# Unsigned 64-bit chunk end offsets
+_OFFSET_TYPECODE = "Q"
+
+# Number of lock shards; a power of two so the shard is a cheap mask
+_LOCK_SHARDS = 64
+
 
 @dataclass
 class StreamMetadata:
@@ -37,9 +48,27 @@ class StreamingBuffer:
         Args:
             max_buffer_size: Maximum number of chunks to keep per message
         """
-        self._buffers: Dict[str, List[str]] = defaultdict(list)
+        # Content is accumulated as UTF-8 in one contiguous bytearray per message,
+        # with the cumulative end offset of each chunk kept alongside it in a
+        # packed array (8 bytes per chunk instead of a pointer plus an int object)
+        self._buffers: Dict[str, bytearray] = {}
+        self._offsets: Dict[str, array] = {}
         self._metadata: Dict[str, StreamMetadata] = {}
+        # Joined content per message, rebuilt only after new chunks arrive
+        self._joined_cache: Dict[str, Optional[str]] = {}
         self.max_buffer_size = max_buffer_size
+        # Chunks kept after an overflow. Capping this at half the limit
+        # guarantees each truncation is followed by enough appends to
+        # amortize its cost, even for small limits.
+        self._keep_chunks = min(1000, max_buffer_size // 2)
+        # Per-message state is guarded by one of a fixed set of sharded locks,
+        # so writers on different messages rarely contend
+        self._locks = [threading.Lock() for _ in range(_LOCK_SHARDS)]
+        # Running totals per lock shard, so stats don't walk every buffer
+        self._shard_chunks = [0] * _LOCK_SHARDS
+        self._shard_bytes = [0] * _LOCK_SHARDS
+        # Message IDs still streaming, in start order
+        self._active: Dict[str, None] = {}
 
         logger.info(f"StreamingBuffer initialized with max_buffer_size={max_buffer_size}")
 
@@ -50,43 +79,74 @@ class StreamingBuffer:
         Args:
             message_id: Unique identifier for the message
         """
-        self._buffers[message_id] = []
-        self._metadata[message_id] = StreamMetadata()
+        with self._lock(message_id):
+            self._forget_totals(message_id)
+            self._buffers[message_id] = bytearray()
+            self._offsets[message_id] = array(_OFFSET_TYPECODE)
+            self._metadata[message_id] = StreamMetadata()
+            self._joined_cache[message_id] = None
+            self._active[message_id] = None
 
         logger.info(f"Started streaming buffer for message {message_id}")
 
-    def add_chunk(self, message_id: str, chunk: str) -> None:
+    def add_chunk(self, message_id: str, chunk: Union[str, bytes]) -> None:
         """
         Add a chunk to the buffer.
 
         Args:
             message_id: Message identifier
-            chunk: Content chunk to add
+            chunk: Content chunk to add, as text or as already UTF-8 encoded
+                bytes (which should hold complete characters)
 
         Raises:
             ValueError: If no active stream for the message
         """
-        if message_id not in self._buffers:
-            raise ValueError(f"No active stream for message {message_id}")
-
-        # Prevent memory overflow
-        if len(self._buffers[message_id]) >= self.max_buffer_size:
-            # Keep last N chunks for recovery
-            logger.warning(
-                f"Buffer overflow for message {message_id}, truncating to last 1000 chunks"
+        # Encode once at the edge, outside the lock
+        data = chunk.encode(_ENCODING, _ERRORS) if isinstance(chunk, str) else chunk
+
+        shard = self._shard(message_id)
+        with self._locks[shard]:
+            buf = self._buffers.get(message_id)
+            if buf is None:
+                raise ValueError(f"No active stream for message {message_id}")
+
+            offsets = self._offsets[message_id]
+
+            # Prevent memory overflow
+            if len(offsets) >= self.max_buffer_size:
+                # Keep last N chunks for recovery
+                logger.warning(
+                    "Buffer overflow for message %s, truncating to last %d chunks",
+                    message_id,
+                    self._keep_chunks,
+                )
+                dropped = len(offsets) - self._keep_chunks
+                cut = offsets[dropped - 1]
+                del buf[:cut]
+                del offsets[:dropped]
+                for i in range(len(offsets)):
+                    offsets[i] -= cut
+                self._shard_chunks[shard] -= dropped
+                self._shard_bytes[shard] -= cut
+
+            buf.extend(data)
+            offsets.append(len(buf))
+            self._shard_chunks[shard] += 1
+            self._shard_bytes[shard] += len(data)
+            self._joined_cache[message_id] = None
+
+            # Update metadata
+            metadata = self._metadata[message_id]
+            metadata.chunk_count += 1
+            metadata.total_bytes += len(data)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Added chunk #%d (%d bytes) to message %s",
+                metadata.chunk_count,
+                len(data),
+                message_id,
             )
-            self._buffers[message_id] = self._buffers[message_id][-1000:]
-
-        self._buffers[message_id].append(chunk)
-
-        # Update metadata
-        metadata = self._metadata[message_id]
-        metadata.chunk_count += 1
-        metadata.total_bytes += len(chunk)
-
-        logger.debug(
-            f"Added chunk #{metadata.chunk_count} ({len(chunk)} bytes) to message {message_id}"
-        )
 
     def get_complete_content(self, message_id: str) -> str:
         """
@@ -98,15 +158,37 @@ class StreamingBuffer:
         Returns:
             Complete content as a single string
         """
-        if message_id not in self._buffers:
-            logger.warning(f"No buffer found for message {message_id}")
-            return ""
+        with self._lock(message_id):
+            if message_id not in self._buffers:
+                logger.warning(f"No buffer found for message {message_id}")
+                return ""
+
+            content = self._joined_cache.get(message_id)
+            if content is None:
+                content = self._buffers[message_id].decode(_ENCODING, _ERRORS)
+                self._joined_cache[message_id] = content
+            logger.debug(
+                "Retrieved complete content for message %s: %d characters", message_id, len(content)
+            )
+            return content
 
-        content = "".join(self._buffers[message_id])
-        logger.debug(
-            f"Retrieved complete content for message {message_id}: {len(content)} characters"
-        )
-        return content
+    def get_complete_bytes(self, message_id: str) -> bytes:
+        """
+        Get the complete accumulated content as UTF-8, for sending without re-encoding.
+
+        Args:
+            message_id: Message identifier
+
+        Returns:
+            Complete content as bytes
+        """
+        with self._lock(message_id):
+            buf = self._buffers.get(message_id)
+            if buf is None:
+                logger.warning(f"No buffer found for message {message_id}")
+                return b""
+
+            return bytes(buf)
 
     def get_chunks_since(self, message_id: str, chunk_index: int) -> List[str]:
         """
@@ -119,15 +201,87 @@ class StreamingBuffer:
         Returns:
             List of chunks from the specified index
         """
-        if message_id not in self._buffers:
-            logger.warning(f"No buffer found for message {message_id}")
-            return []
+        with self._lock(message_id):
+            if message_id not in self._buffers:
+                logger.warning(f"No buffer found for message {message_id}")
+                return []
+
+            offsets = self._offsets[message_id]
+            start, indices = self._chunk_start(offsets, chunk_index)
+            chunks = []
+            # Decode straight from a view so no intermediate bytearray slices are made
+            with memoryview(self._buffers[message_id]) as view:
+                for end in offsets[indices.start : indices.stop]:
+                    chunks.append(str(view[start:end], _ENCODING, _ERRORS))
+                    start = end
+            logger.info(
+                f"Retrieved {len(chunks)} chunks for message {message_id} starting from index {chunk_index}"
+            )
+            return chunks
 
-        chunks = self._buffers[message_id][chunk_index:]
-        logger.info(
-            f"Retrieved {len(chunks)} chunks for message {message_id} starting from index {chunk_index}"
-        )
-        return chunks
+    def get_bytes_since(self, message_id: str, chunk_index: int) -> bytes:
+        """
+        Get the UTF-8 content since a specific chunk index in one copy (for reconnection).
+
+        Args:
+            message_id: Message identifier
+            chunk_index: Starting chunk index
+
+        Returns:
+            Encoded content from the specified chunk onwards
+        """
+        with self._lock(message_id):
+            if message_id not in self._buffers:
+                logger.warning(f"No buffer found for message {message_id}")
+                return b""
+
+            start, indices = self._chunk_start(self._offsets[message_id], chunk_index)
+            if not indices:
+                return b""
+
+            # Copy out rather than returning a view: a live export would stop the
+            # bytearray from growing on the next add_chunk
+            with memoryview(self._buffers[message_id]) as view:
+                return bytes(view[start:])
+
+    def get_content_since(self, message_id: str, chunk_index: int) -> str:
+        """
+        Get the content since a specific chunk index as one string (for reconnection).
+
+        Args:
+            message_id: Message identifier
+            chunk_index: Starting chunk index
+
+        Returns:
+            Content from the specified chunk onwards, decoded once
+        """
+        with self._lock(message_id):
+            if message_id not in self._buffers:
+                logger.warning(f"No buffer found for message {message_id}")
+                return ""
+
+            start, indices = self._chunk_start(self._offsets[message_id], chunk_index)
+            if not indices:
+                return ""
+
+            with memoryview(self._buffers[message_id]) as view:
+                return str(view[start:], _ENCODING, _ERRORS)
+
+    @staticmethod
+    def _chunk_start(offsets: array, chunk_index: int) -> Tuple[int, range]:
+        """
+        Resolve a chunk index the way list slicing would.
+
+        Args:
+            offsets: Cumulative end offsets of the buffer's chunks
+            chunk_index: Starting chunk index (may be negative)
+
+        Returns:
+            Tuple of (byte offset of the first selected chunk, selected chunk indices)
+        """
+        indices = range(len(offsets))[chunk_index:]
+        start = offsets[indices[0] - 1] if indices and indices[0] > 0 else 0
+        return start, indices
 
     def get_metadata(self, message_id: str) -> Optional[StreamMetadata]:
         """
@@ -152,24 +306,26 @@ class StreamingBuffer:
         Returns:
             Dictionary containing streaming metadata
         """
-        if message_id not in self._metadata:
-            logger.warning(f"No metadata found for message {message_id}")
-            return {}
-
-        metadata = self._metadata[message_id]
-        metadata.is_streaming = False
-        metadata.end_time = time.time()
-        metadata.error = error
-
-        duration = metadata.end_time - metadata.start_time
-
-        result = {
-            "chunk_count": metadata.chunk_count,
-            "total_bytes": metadata.total_bytes,
-            "duration": duration,
-            "is_streaming": metadata.is_streaming,
-            "error": metadata.error,
-        }
+        with self._lock(message_id):
+            metadata = self._metadata.get(message_id)
+            if metadata is None:
+                logger.warning(f"No metadata found for message {message_id}")
+                return {}
+
+            metadata.is_streaming = False
+            self._active.pop(message_id, None)
+            metadata.end_time = time.time()
+            metadata.error = error
+
+            duration = metadata.end_time - metadata.start_time
+
+            result = {
+                "chunk_count": metadata.chunk_count,
+                "total_bytes": metadata.total_bytes,
+                "duration": duration,
+                "is_streaming": metadata.is_streaming,
+                "error": metadata.error,
+            }
 
         logger.info(
             f"Ended streaming for message {message_id}: "
@@ -186,12 +342,45 @@ class StreamingBuffer:
         Args:
             message_id: Message identifier
         """
-        content_length = len(self.get_complete_content(message_id))
+        with self._lock(message_id):
+            content_bytes = self._forget_totals(message_id)
+
+            self._buffers.pop(message_id, None)
+            self._offsets.pop(message_id, None)
+            self._metadata.pop(message_id, None)
+            self._joined_cache.pop(message_id, None)
+            self._active.pop(message_id, None)
+
+        logger.info(f"Cleaned up buffer for message {message_id} ({content_bytes} bytes)")
+
+    def _forget_totals(self, message_id: str) -> int:
+        """
+        Remove a buffer's chunks and bytes from the running totals.
+        The caller must hold the message's lock.
+
+        Args:
+            message_id: Message identifier
+
+        Returns:
+            Number of bytes the buffer held
+        """
+        buf = self._buffers.get(message_id)
+        if buf is None:
+            return 0
 
-        self._buffers.pop(message_id, None)
-        self._metadata.pop(message_id, None)
+        shard = self._shard(message_id)
+        self._shard_chunks[shard] -= len(self._offsets[message_id])
+        self._shard_bytes[shard] -= len(buf)
+        return len(buf)
 
-        logger.info(f"Cleaned up buffer for message {message_id} ({content_length} characters)")
+    @staticmethod
+    def _shard(message_id: str) -> int:
+        """Map a message ID to its lock shard."""
+        return hash(message_id) & (_LOCK_SHARDS - 1)
+
+    def _lock(self, message_id: str) -> threading.Lock:
+        """Get the lock guarding a message's buffer state."""
+        return self._locks[self._shard(message_id)]
 
     def get_active_streams(self) -> List[str]:
         """
@@ -200,8 +389,8 @@ class StreamingBuffer:
         Returns:
             List of message IDs that are currently streaming
         """
-        active = [msg_id for msg_id, metadata in self._metadata.items() if metadata.is_streaming]
-        logger.debug(f"Found {len(active)} active streams")
+        active = list(self._active)
+        logger.debug("Found %d active streams", len(active))
         return active
 
     def get_memory_usage(self) -> dict:
@@ -211,14 +400,11 @@ class StreamingBuffer:
         Returns:
             Dictionary with memory usage information
         """
-        total_chunks = sum(len(chunks) for chunks in self._buffers.values())
-        total_bytes = sum(sum(len(chunk) for chunk in chunks) for chunks in self._buffers.values())
-
         return {
             "buffer_count": len(self._buffers),
-            "total_chunks": total_chunks,
-            "total_bytes": total_bytes,
-            "active_streams": len(self.get_active_streams()),
+            "total_chunks": sum(self._shard_chunks),
+            "total_bytes": sum(self._shard_bytes),
+            "active_streams": len(self._active),
         }
 
     def has_buffer(self, message_id: str) -> bool:
@@ -240,10 +426,16 @@ class StreamingBuffer:
         Args:
             message_id: Message identifier
         """
-        if message_id in self._buffers:
-            self._buffers[message_id] = []
+        with self._lock(message_id):
+            if message_id not in self._buffers:
+                return
+
+            self._forget_totals(message_id)
+            self._buffers[message_id] = bytearray()
+            self._offsets[message_id] = array(_OFFSET_TYPECODE)
+            self._joined_cache[message_id] = None
             if message_id in self._metadata:
                 self._metadata[message_id].chunk_count = 0
                 self._metadata[message_id].total_bytes = 0
 
-            logger.info(f"Reset buffer for message {message_id}")
+        logger.info(f"Reset buffer for message {message_id}")
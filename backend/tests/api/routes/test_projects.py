@@ -1,85 +1,231 @@
 """Tests for Projects API routes."""
 
+import json as jsonlib
+import os
+
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi import FastAPI
-from httpx import AsyncClient, ASGITransport
-from sqlalchemy import select
-
-from app.api.routes.projects import router
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.api.routes import projects
+from app.api.routes.projects import (
+    create_project,
+    get_project,
+    list_projects,
+    router,
+    update_project,
+)
+from app.core.storage.database import get_db
 from app.models.database import Project, AgentConfiguration, ChatSession
+from app.models.schemas import ProjectCreate, ProjectUpdate
 
 
-@pytest.fixture
-def app(db_session):
-    """Create FastAPI app with projects router."""
+pytestmark = [pytest.mark.api, pytest.mark.asyncio(loop_scope="session")]
+
+# Tests that send requests about rows from the local db_session, or rely on the
+# cleanup fake; a backend at TEST_TARGET_URL can see neither
+local_only = pytest.mark.skipif(
+    bool(os.environ.get("TEST_TARGET_URL")),
+    reason="needs the in-process app and the test database",
+)
+
+PROJECTS_URL = "/api/v1/projects"
+
+
+def project_url(project_id: str, *parts: str) -> str:
+    """Build the path of a project, or of one of its sub-resources."""
+    return "/".join((PROJECTS_URL, project_id, *parts))
+
+
+PROJECT_COUNT_STMT = select(func.count()).select_from(Project)
+
+
+# Lambda statements are keyed on their code location, so repeat executions
+# reuse the cached construction and compilation with only project_id bound.
+def project_id_stmt(project_id: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Project.id).where(Project.id == project_id))
+
+
+def agent_config_id_stmt(project_id: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(AgentConfiguration.id).where(AgentConfiguration.project_id == project_id)
+    )
+
+
+def chat_session_ids_stmt(project_id: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(ChatSession.id).where(ChatSession.project_id == project_id))
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Create FastAPI app with projects router, shared by the whole module."""
     app = FastAPI()
     app.include_router(router, prefix="/api/v1")
+    return app
+
+
+@pytest.fixture(autouse=True)
+def override_db(app, db_session):
+    """Point the shared app at this test's database session."""
 
     async def get_test_db():
         yield db_session
 
-    from app.core.storage.database import get_db
-
     app.dependency_overrides[get_db] = get_test_db
+    yield
+    app.dependency_overrides.clear()
+
+
+class ASGIResponse:
+    """Response collected from a direct ASGI call."""
+
+    def __init__(self, status_code: int, headers: list, body: bytes):
+        self.status_code = status_code
+        self.headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in headers}
+        self.content = body
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+
+@pytest.fixture(scope="module")
+def call(app, request):
+    """Invoke the app directly through ASGI, without an HTTP client in between.
+
+    With TEST_TARGET_URL set, requests go to that backend over the shared
+    keep-alive live_client instead, and tests marked local_only are skipped.
+    """
+    if os.environ.get("TEST_TARGET_URL"):
+        live_client = request.getfixturevalue("live_client")
+
+        async def _call_live(method: str, path: str, json=None) -> httpx.Response:
+            return await live_client.request(method, path, json=json)
+
+        return _call_live
+
+    async def _call(method: str, path: str, json=None) -> ASGIResponse:
+        path, _, query = path.partition("?")
+        body = b"" if json is None else jsonlib.dumps(json, separators=(",", ":")).encode()
+        headers = [(b"host", b"test")]
+        if json is not None:
+            headers.append((b"content-type", b"application/json"))
+            headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("testclient", 50000),
+            "server": ("test", 80),
+        }
+        request_sent = False
+        status_code = None
+        response_headers: list = []
+        chunks: list = []
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await app(scope, receive, send)
+        return ASGIResponse(status_code, response_headers, b"".join(chunks))
+
+    return _call
+
+
+class FakeCleanup:
+    """Stands in for the container manager, volume storage and file manager.
+
+    Records the id passed to each cleanup call and raises ``error`` when set.
+    """
+
+    def __init__(self):
+        self.destroyed: list = []
+        self.deleted_volumes: list = []
+        self.deleted_dirs: list = []
+        self.error = None
+
+    async def destroy_container(self, session_id: str) -> bool:
+        self.destroyed.append(session_id)
+        return self._result()
+
+    async def delete_volume(self, project_id: str) -> bool:
+        self.deleted_volumes.append(project_id)
+        return self._result()
+
+    def delete_project_directory(self, project_id: str) -> bool:
+        self.deleted_dirs.append(project_id)
+        return self._result()
+
+    def _result(self) -> bool:
+        if self.error is not None:
+            raise self.error
+        return True
 
-    return app
+
+@pytest.fixture
+def cleanup(monkeypatch):
+    """Stub the container, volume and file cleanup done when a project is deleted."""
+    fake = FakeCleanup()
+    monkeypatch.setattr(projects, "get_container_manager", lambda: fake)
+    monkeypatch.setattr(projects, "get_project_volume_storage", lambda: fake)
+    monkeypatch.setattr(projects, "get_file_manager", lambda: fake)
+    return fake
 
 
-@pytest.mark.api
 class TestProjectsAPI:
     """Test cases for Projects API."""
 
-    @pytest.mark.asyncio
-    async def test_list_projects_empty(self, app, db_session):
-        """Test listing projects when empty."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["projects"] == []
-        assert data["total"] == 0
-
-    @pytest.mark.asyncio
-    async def test_list_projects(self, app, db_session, sample_project):
+    @local_only
+    async def test_list_projects(self, call, db_session, sample_project):
         """Test listing projects."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects")
+        response = await call("GET", PROJECTS_URL)
 
         assert response.status_code == 200
         data = response.json()
         assert data["total"] >= 1
         assert any(p["id"] == sample_project.id for p in data["projects"])
 
-    @pytest.mark.asyncio
-    async def test_list_projects_pagination(self, app, db_session):
+    async def test_list_projects_pagination(self, db_session):
         """Test project listing with pagination."""
+        # Other tests in the class may share the sample project
+        existing = await db_session.scalar(PROJECT_COUNT_STMT)
+
         # Create multiple projects
-        for i in range(5):
-            project = Project(name=f"Project {i}")
-            db_session.add(project)
+        db_session.add_all([Project(name=f"Project {i}") for i in range(5)])
         await db_session.commit()
 
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects?skip=2&limit=2")
+        result = await list_projects(skip=2, limit=2, db=db_session)
 
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["projects"]) == 2
-        assert data["total"] == 5
+        assert len(result.projects) == 2
+        assert result.total == existing + 5
 
-    @pytest.mark.asyncio
-    async def test_create_project(self, app, db_session):
+    async def test_create_project(self, call, db_session):
         """Test creating a new project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                "/api/v1/projects", json={"name": "New Project", "description": "Test description"}
-            )
+        response = await call(
+            "POST",
+            PROJECTS_URL,
+            json={"name": "New Project", "description": "Test description"},
+        )
 
         assert response.status_code == 201
         data = response.json()
@@ -88,90 +234,46 @@ class TestProjectsAPI:
         assert "id" in data
         assert "created_at" in data
 
-    @pytest.mark.asyncio
-    async def test_create_project_with_agent_config(self, app, db_session):
+    async def test_create_project_with_agent_config(self, db_session):
         """Test that creating project also creates agent config."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post("/api/v1/projects", json={"name": "Project with Config"})
-
-        assert response.status_code == 201
-        project_id = response.json()["id"]
+        project = await create_project(ProjectCreate(name="Project with Config"), db=db_session)
 
         # Check that agent config was created
-        query = select(AgentConfiguration).where(AgentConfiguration.project_id == project_id)
-        result = await db_session.execute(query)
-        config = result.scalar_one_or_none()
-
-        assert config is not None
-        assert config.project_id == project_id
+        result = await db_session.execute(agent_config_id_stmt(project.id))
+        assert result.scalar_one_or_none() is not None
 
-    @pytest.mark.asyncio
-    async def test_get_project(self, app, db_session, sample_project):
+    async def test_get_project(self, db_session, sample_project):
         """Test getting a project by ID."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get(f"/api/v1/projects/{sample_project.id}")
+        project = await get_project(sample_project.id, db=db_session)
 
-        assert response.status_code == 200
-        data = response.json()
-        assert data["id"] == sample_project.id
-        assert data["name"] == sample_project.name
+        assert project.id == sample_project.id
+        assert project.name == sample_project.name
 
-    @pytest.mark.asyncio
-    async def test_get_project_not_found(self, app, db_session):
-        """Test getting a non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects/nonexistent-id")
-
-        assert response.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_update_project(self, app, db_session, sample_project):
+    async def test_update_project(self, db_session, sample_project):
         """Test updating a project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.put(
-                f"/api/v1/projects/{sample_project.id}",
-                json={"name": "Updated Name", "description": "Updated description"},
-            )
+        project = await update_project(
+            sample_project.id,
+            ProjectUpdate(name="Updated Name", description="Updated description"),
+            db=db_session,
+        )
 
-        assert response.status_code == 200
-        data = response.json()
-        assert data["name"] == "Updated Name"
-        assert data["description"] == "Updated description"
+        assert project.name == "Updated Name"
+        assert project.description == "Updated description"
 
-    @pytest.mark.asyncio
-    async def test_update_project_partial(self, app, db_session, sample_project):
+    async def test_update_project_partial(self, db_session, sample_project):
         """Test partial project update."""
         original_description = sample_project.description
 
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.put(
-                f"/api/v1/projects/{sample_project.id}", json={"name": "Only Name Updated"}
-            )
+        project = await update_project(
+            sample_project.id, ProjectUpdate(name="Only Name Updated"), db=db_session
+        )
 
-        assert response.status_code == 200
-        data = response.json()
-        assert data["name"] == "Only Name Updated"
+        assert project.name == "Only Name Updated"
         # Description should remain unchanged
-        assert data["description"] == original_description
-
-    @pytest.mark.asyncio
-    async def test_update_project_not_found(self, app, db_session):
-        """Test updating a non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.put(
-                "/api/v1/projects/nonexistent-id", json={"name": "New Name"}
-            )
-
-        assert response.status_code == 404
+        assert project.description == original_description
 
-    @pytest.mark.asyncio
-    async def test_delete_project(self, app, db_session, sample_project):
+    @local_only
+    async def test_delete_project(self, call, db_session, sample_project, cleanup):
         """Test deleting a project cleans up containers, volumes, and local files."""
         project_id = sample_project.id
 
@@ -179,166 +281,102 @@ class TestProjectsAPI:
         session = ChatSession(project_id=project_id, name="Test Session")
         db_session.add(session)
         await db_session.commit()
-        await db_session.refresh(session)
         session_id = session.id
 
-        with (
-            patch("app.api.routes.projects.get_container_manager") as mock_container_mgr,
-            patch("app.api.routes.projects.get_project_volume_storage") as mock_vol_storage,
-            patch("app.api.routes.projects.get_file_manager") as mock_file_mgr,
-        ):
+        response = await call("DELETE", project_url(project_id))
 
-            # Mock container manager - should destroy containers for all sessions
-            mock_destroy = AsyncMock(return_value=True)
-            mock_container_mgr.return_value.destroy_container = mock_destroy
+        assert response.status_code == 204
 
-            # Mock volume storage - should delete project volume
-            mock_delete_vol = AsyncMock(return_value=True)
-            mock_vol_storage.return_value.delete_volume = mock_delete_vol
+        # Verify container cleanup was called for each session
+        assert cleanup.destroyed == [session_id]
 
-            # Mock file manager - should delete project files directory
-            mock_delete_dir = MagicMock(return_value=True)
-            mock_file_mgr.return_value.delete_project_directory = mock_delete_dir
+        # Verify volume cleanup was called
+        assert cleanup.deleted_volumes == [project_id]
 
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.delete(f"/api/v1/projects/{project_id}")
-
-            assert response.status_code == 204
-
-            # Verify container cleanup was called for each session
-            mock_destroy.assert_called_with(session_id)
-
-            # Verify volume cleanup was called
-            mock_delete_vol.assert_called_once_with(project_id)
-
-            # Verify local files cleanup was called
-            mock_delete_dir.assert_called_once_with(project_id)
+        # Verify local files cleanup was called
+        assert cleanup.deleted_dirs == [project_id]
 
         # Verify database deletion
-        query = select(Project).where(Project.id == project_id)
-        result = await db_session.execute(query)
-        deleted = result.scalar_one_or_none()
-        assert deleted is None
+        result = await db_session.execute(project_id_stmt(project_id))
+        assert result.scalar_one_or_none() is None
 
-    @pytest.mark.asyncio
-    async def test_delete_project_with_multiple_sessions(self, app, db_session, sample_project):
+    @local_only
+    async def test_delete_project_with_multiple_sessions(
+        self, call, db_session, sample_project, cleanup
+    ):
         """Test deleting a project destroys all associated session containers."""
         project_id = sample_project.id
 
         # Create multiple chat sessions
-        session_ids = []
-        for i in range(3):
-            session = ChatSession(project_id=project_id, name=f"Session {i}")
-            db_session.add(session)
-            await db_session.commit()
-            await db_session.refresh(session)
-            session_ids.append(session.id)
-
-        with (
-            patch("app.api.routes.projects.get_container_manager") as mock_container_mgr,
-            patch("app.api.routes.projects.get_project_volume_storage") as mock_vol_storage,
-            patch("app.api.routes.projects.get_file_manager") as mock_file_mgr,
-        ):
-
-            mock_destroy = AsyncMock(return_value=True)
-            mock_container_mgr.return_value.destroy_container = mock_destroy
-            mock_vol_storage.return_value.delete_volume = AsyncMock(return_value=True)
-            mock_file_mgr.return_value.delete_project_directory = MagicMock(return_value=True)
-
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.delete(f"/api/v1/projects/{project_id}")
-
-            assert response.status_code == 204
-
-            # Verify container cleanup was called for all sessions
-            assert mock_destroy.call_count == 3
-            called_session_ids = [call[0][0] for call in mock_destroy.call_args_list]
-            for sid in session_ids:
-                assert sid in called_session_ids
-
-    @pytest.mark.asyncio
+        db_session.add_all(
+            [ChatSession(project_id=project_id, name=f"Session {i}") for i in range(3)]
+        )
+        await db_session.commit()
+        result = await db_session.execute(chat_session_ids_stmt(project_id))
+        session_ids = result.scalars().all()
+
+        response = await call("DELETE", project_url(project_id))
+
+        assert response.status_code == 204
+
+        # Verify container cleanup was called for all sessions
+        assert len(cleanup.destroyed) == 3
+        assert sorted(cleanup.destroyed) == sorted(session_ids)
+
+    @local_only
     async def test_delete_project_cleanup_failures_dont_block_deletion(
-        self, app, db_session, sample_project
+        self, call, db_session, sample_project, cleanup
     ):
         """Test that cleanup failures don't prevent project deletion."""
         project_id = sample_project.id
 
-        with (
-            patch("app.api.routes.projects.get_container_manager") as mock_container_mgr,
-            patch("app.api.routes.projects.get_project_volume_storage") as mock_vol_storage,
-            patch("app.api.routes.projects.get_file_manager") as mock_file_mgr,
-        ):
-
-            # Simulate cleanup failures
-            mock_container_mgr.return_value.destroy_container = AsyncMock(
-                side_effect=Exception("Container error")
-            )
-            mock_vol_storage.return_value.delete_volume = AsyncMock(
-                side_effect=Exception("Volume error")
-            )
-            mock_file_mgr.return_value.delete_project_directory = MagicMock(
-                side_effect=Exception("File error")
-            )
-
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url="http://test") as client:
-                response = await client.delete(f"/api/v1/projects/{project_id}")
-
-            # Should still succeed - cleanup failures should be logged but not block deletion
-            assert response.status_code == 204
+        # Simulate cleanup failures
+        cleanup.error = Exception("Cleanup error")
+
+        response = await call("DELETE", project_url(project_id))
+
+        # Should still succeed - cleanup failures should be logged but not block deletion
+        assert response.status_code == 204
 
         # Verify database deletion still happened
-        query = select(Project).where(Project.id == project_id)
-        result = await db_session.execute(query)
-        deleted = result.scalar_one_or_none()
-        assert deleted is None
-
-    @pytest.mark.asyncio
-    async def test_delete_project_not_found(self, app, db_session):
-        """Test deleting a non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.delete("/api/v1/projects/nonexistent-id")
+        result = await db_session.execute(project_id_stmt(project_id))
+        assert result.scalar_one_or_none() is None
 
-        assert response.status_code == 404
 
+@local_only
+class TestProjectsAPIEmpty:
+    """Test cases for Projects API with no sample rows."""
+
+    async def test_list_projects_empty(self, call, db_session):
+        """Test listing projects when empty."""
+        response = await call("GET", PROJECTS_URL)
 
-@pytest.mark.api
+        assert response.status_code == 200
+        data = response.json()
+        assert data["projects"] == []
+        assert data["total"] == 0
+
+
+@local_only
 class TestAgentConfigAPI:
     """Test cases for Agent Configuration API."""
 
-    @pytest.mark.asyncio
-    async def test_get_agent_config(self, app, db_session, sample_project, sample_agent_config):
+    async def test_get_agent_config(self, call, db_session, sample_project, sample_agent_config):
         """Test getting agent configuration."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get(f"/api/v1/projects/{sample_project.id}/agent-config")
+        response = await call("GET", project_url(sample_project.id, "agent-config"))
 
         assert response.status_code == 200
         data = response.json()
         assert data["project_id"] == sample_project.id
         assert data["llm_provider"] == sample_agent_config.llm_provider
 
-    @pytest.mark.asyncio
-    async def test_get_agent_config_not_found(self, app, db_session):
-        """Test getting config for non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects/nonexistent/agent-config")
-
-        assert response.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_update_agent_config(self, app, db_session, sample_project, sample_agent_config):
+    async def test_update_agent_config(self, call, db_session, sample_project, sample_agent_config):
         """Test updating agent configuration."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.put(
-                f"/api/v1/projects/{sample_project.id}/agent-config",
-                json={"llm_model": "gpt-4o", "llm_config": {"temperature": 0.5}},
-            )
+        response = await call(
+            "PUT",
+            project_url(sample_project.id, "agent-config"),
+            json={"llm_model": "gpt-4o", "llm_config": {"temperature": 0.5}},
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -346,53 +384,57 @@ class TestAgentConfigAPI:
         assert data["llm_config"]["temperature"] == 0.5
 
 
-@pytest.mark.api
+@local_only
 class TestChatSessionAPI:
     """Test cases for Chat Session API."""
 
-    @pytest.mark.asyncio
-    async def test_create_chat_session(self, app, db_session, sample_project):
+    async def test_create_chat_session(self, call, db_session, sample_project):
         """Test creating a chat session."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                f"/api/v1/projects/{sample_project.id}/chat-sessions",
-                json={"name": "New Chat Session"},
-            )
+        response = await call(
+            "POST",
+            project_url(sample_project.id, "chat-sessions"),
+            json={"name": "New Chat Session"},
+        )
 
         assert response.status_code == 201
         data = response.json()
         assert data["name"] == "New Chat Session"
         assert data["project_id"] == sample_project.id
 
-    @pytest.mark.asyncio
-    async def test_create_chat_session_project_not_found(self, app, db_session):
-        """Test creating chat session for non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                "/api/v1/projects/nonexistent/chat-sessions", json={"name": "Session"}
-            )
-
-        assert response.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_list_chat_sessions(self, app, db_session, sample_project, sample_chat_session):
+    async def test_list_chat_sessions(self, call, db_session, sample_project, sample_chat_session):
         """Test listing chat sessions for a project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get(f"/api/v1/projects/{sample_project.id}/chat-sessions")
+        response = await call("GET", project_url(sample_project.id, "chat-sessions"))
 
         assert response.status_code == 200
         data = response.json()
         assert data["total"] >= 1
         assert any(s["id"] == sample_chat_session.id for s in data["chat_sessions"])
 
-    @pytest.mark.asyncio
-    async def test_list_chat_sessions_project_not_found(self, app, db_session):
-        """Test listing sessions for non-existent project."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/v1/projects/nonexistent/chat-sessions")
+
+class TestProjectNotFound:
+    """Every project-scoped endpoint answers 404 for an unknown project."""
+
+    @pytest.mark.parametrize(
+        "method, path, body",
+        [
+            ("GET", project_url("nonexistent-id"), None),
+            ("PUT", project_url("nonexistent-id"), {"name": "New Name"}),
+            ("DELETE", project_url("nonexistent-id"), None),
+            ("GET", project_url("nonexistent", "agent-config"), None),
+            ("POST", project_url("nonexistent", "chat-sessions"), {"name": "Session"}),
+            ("GET", project_url("nonexistent", "chat-sessions"), None),
+        ],
+        ids=[
+            "get_project",
+            "update_project",
+            "delete_project",
+            "get_agent_config",
+            "create_chat_session",
+            "list_chat_sessions",
+        ],
+    )
+    async def test_nonexistent_project_returns_404(self, call, db_session, method, path, body):
+        """Test requests against a non-existent project."""
+        response = await call(method, path, json=body)
 
         assert response.status_code == 404
@@ -42,16 +42,6 @@ class TestSandboxStartAPI:
 
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_start_sandbox_no_config(self, app, db_session, sample_chat_session):
-        """Test starting sandbox without agent configuration."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(f"/api/v1/sandbox/{sample_chat_session.id}/start")
-
-        assert response.status_code == 404
-        assert "configuration" in response.json()["detail"].lower()
-
     @pytest.mark.asyncio
     async def test_start_sandbox_success(
         self, app, db_session, sample_chat_session, sample_agent_config
@@ -99,6 +89,21 @@ class TestSandboxStartAPI:
             assert response.status_code == 500
 
 
+@pytest.mark.api
+class TestSandboxStartNoConfigAPI:
+    """Test cases for sandbox start without an agent configuration."""
+
+    @pytest.mark.asyncio
+    async def test_start_sandbox_no_config(self, app, db_session, sample_chat_session):
+        """Test starting sandbox without agent configuration."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(f"/api/v1/sandbox/{sample_chat_session.id}/start")
+
+        assert response.status_code == 404
+        assert "configuration" in response.json()["detail"].lower()
+
+
 @pytest.mark.api
 class TestSandboxStopAPI:
     """Test cases for sandbox stop API."""
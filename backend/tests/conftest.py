@@ -2,15 +2,18 @@
 Pytest configuration and fixtures for the Open Claude Pilot backend test suite.
 """
 
+import importlib.util
 import os
 import tempfile
 from pathlib import Path
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 # Set test environment variables before importing app modules
@@ -36,51 +39,101 @@ from app.models.database.file import FileType
 # Event Loop Configuration
 # ============================================================================
 
-# Note: event_loop fixture moved to conftest files with function scope to avoid
-# conflicts when running all tests together. The pytest_asyncio.fixture uses
-# the default event loop configuration.
+# Note: all async tests and fixtures share one session-scoped event loop
+# (asyncio_default_fixture_loop_scope / asyncio_default_test_loop_scope in
+# pytest.ini). Fixtures keep their own scope, so db_session still isolates
+# every test.
 
 
 # ============================================================================
 # Database Fixtures
 # ============================================================================
 
-
-@pytest_asyncio.fixture
+# Each worker process builds one in-memory SQLite database and creates the
+# schema once, so the suite can be split across pytest-xdist workers
+# (``pytest -n auto``) without per-worker database files: workers never share
+# tables, and each worker process binds app.dependency_overrides[get_db] on
+# its own app instances.
+#
+# Each test class runs on one connection inside a transaction that is rolled
+# back when the class finishes, and every test runs in a SAVEPOINT on that
+# connection that is rolled back afterwards. Rows committed by a test (or by
+# the code under test) never reach the next one.
+#
+# The sample project, agent config and chat session are the exception: they
+# are inserted once per class, the first time a test in the class asks for
+# one, and stay visible to every later test in that class. Tests that need
+# them absent (empty listings, a project without a config) go in a class that
+# never requests them, and other tests must not count on their absence.
+
+
+def _enable_savepoints(engine) -> None:
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest under it on SQLite."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest_asyncio.fixture(scope="session")
 async def async_engine():
-    """Create an async test database engine."""
+    """Create the async test database engine and schema once per session."""
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
         echo=False,
         poolclass=StaticPool,
         connect_args={"check_same_thread": False},
     )
+    _enable_savepoints(engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     yield engine
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-
     await engine.dispose()
 
 
+@pytest_asyncio.fixture(scope="class")
+async def db_connection(async_engine) -> AsyncGenerator[AsyncConnection, None]:
+    """Open one connection per class inside a transaction that is never committed."""
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
+
+
 @pytest_asyncio.fixture
-async def db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create an async database session for testing."""
-    async_session_maker = async_sessionmaker(
-        async_engine,
-        class_=AsyncSession,
+async def db_session(db_connection) -> AsyncGenerator[AsyncSession, None]:
+    """Create an async database session for testing, rolled back after the test."""
+    savepoint = await db_connection.begin_nested()
+    session = AsyncSession(
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
         expire_on_commit=False,
-        autocommit=False,
         autoflush=False,
     )
 
-    async with async_session_maker() as session:
+    try:
         yield session
-        await session.rollback()
+    finally:
+        await session.close()
+        if savepoint.is_active:
+            await savepoint.rollback()
+
+
+async def _insert(db_connection: AsyncConnection, instance):
+    """Commit a row into the class transaction, outside any test's savepoint."""
+    async with AsyncSession(
+        bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False
+    ) as session:
+        session.add(instance)
+        await session.commit()
+    return instance.id
 
 
 # ============================================================================
@@ -88,51 +141,68 @@ async def db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
 # ============================================================================
 
 
+@pytest_asyncio.fixture(scope="class")
+async def sample_project_id(db_connection: AsyncConnection) -> str:
+    """Insert the sample project once per test class."""
+    return await _insert(
+        db_connection,
+        Project(
+            name="Test Project",
+            description="A test project for unit testing",
+        ),
+    )
+
+
 @pytest_asyncio.fixture
-async def sample_project(db_session: AsyncSession) -> Project:
-    """Create a sample project for testing."""
-    project = Project(
-        name="Test Project",
-        description="A test project for unit testing",
+async def sample_project(db_session: AsyncSession, sample_project_id: str) -> Project:
+    """Load the class's sample project into this test's session."""
+    return await db_session.get(Project, sample_project_id)
+
+
+@pytest_asyncio.fixture(scope="class")
+async def sample_agent_config_id(db_connection: AsyncConnection, sample_project_id: str) -> str:
+    """Insert the sample agent configuration once per test class."""
+    return await _insert(
+        db_connection,
+        AgentConfiguration(
+            project_id=sample_project_id,
+            agent_type="code_agent",
+            system_instructions="You are a helpful coding assistant.",
+            enabled_tools=["bash", "file_read", "file_write"],
+            llm_provider="openai",
+            llm_model="gpt-5-mini",
+            llm_config={"temperature": 0.7, "max_tokens": 4096},
+        ),
     )
-    db_session.add(project)
-    await db_session.commit()
-    await db_session.refresh(project)
-    return project
 
 
 @pytest_asyncio.fixture
 async def sample_agent_config(
-    db_session: AsyncSession, sample_project: Project
+    db_session: AsyncSession, sample_project: Project, sample_agent_config_id: str
 ) -> AgentConfiguration:
-    """Create a sample agent configuration."""
-    config = AgentConfiguration(
-        project_id=sample_project.id,
-        agent_type="code_agent",
-        system_instructions="You are a helpful coding assistant.",
-        enabled_tools=["bash", "file_read", "file_write"],
-        llm_provider="openai",
-        llm_model="gpt-5-mini",
-        llm_config={"temperature": 0.7, "max_tokens": 4096},
+    """Load the class's sample agent configuration into this test's session."""
+    return await db_session.get(AgentConfiguration, sample_agent_config_id)
+
+
+@pytest_asyncio.fixture(scope="class")
+async def sample_chat_session_id(db_connection: AsyncConnection, sample_project_id: str) -> str:
+    """Insert the sample chat session once per test class."""
+    return await _insert(
+        db_connection,
+        ChatSession(
+            project_id=sample_project_id,
+            name="Test Chat Session",
+            status=ChatSessionStatus.ACTIVE,
+        ),
     )
-    db_session.add(config)
-    await db_session.commit()
-    await db_session.refresh(config)
-    return config
 
 
 @pytest_asyncio.fixture
-async def sample_chat_session(db_session: AsyncSession, sample_project: Project) -> ChatSession:
-    """Create a sample chat session for testing."""
-    session = ChatSession(
-        project_id=sample_project.id,
-        name="Test Chat Session",
-        status=ChatSessionStatus.ACTIVE,
-    )
-    db_session.add(session)
-    await db_session.commit()
-    await db_session.refresh(session)
-    return session
+async def sample_chat_session(
+    db_session: AsyncSession, sample_project: Project, sample_chat_session_id: str
+) -> ChatSession:
+    """Load the class's sample chat session into this test's session."""
+    return await db_session.get(ChatSession, sample_chat_session_id)
 
 
 @pytest_asyncio.fixture
@@ -283,7 +353,7 @@ def encryption_key():
 
 
 @pytest_asyncio.fixture
-async def test_app(async_engine):
+async def test_app(db_session):
     """Create a test FastAPI application instance."""
     from fastapi import FastAPI
     from app.api.routes import projects, chat, files, settings
@@ -294,15 +364,9 @@ async def test_app(async_engine):
     app.include_router(files.router, prefix="/api/v1")
     app.include_router(settings.router, prefix="/api/v1")
 
-    # Override database dependency
+    # Override database dependency with the test's rolled-back session
     async def get_test_db():
-        async_session_maker = async_sessionmaker(
-            async_engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-        )
-        async with async_session_maker() as session:
-            yield session
+        yield db_session
 
     from app.core.storage.database import get_db
 
@@ -311,6 +375,26 @@ async def test_app(async_engine):
     return app
 
 
+# Set TEST_TARGET_URL to run route tests against a running backend instead of
+# the in-process app. Rows created through db_session are not visible there.
+TEST_TARGET_URL = os.environ.get("TEST_TARGET_URL")
+
+
+@pytest_asyncio.fixture(scope="session")
+async def live_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Keep-alive HTTP client for the backend at TEST_TARGET_URL, shared by the session."""
+    if not TEST_TARGET_URL:
+        pytest.skip("TEST_TARGET_URL is not set")
+
+    async with httpx.AsyncClient(
+        base_url=TEST_TARGET_URL,
+        # HTTP/2 needs the optional h2 package
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    ) as client:
+        yield client
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -246,6 +246,15 @@ class TestTool:
         assert result.success is False
         assert "execution error" in result.error.lower()
 
+    @pytest.mark.asyncio
+    async def test_execute_stream_default_yields_full_output(self):
+        """Test default execute_stream yields the execute() output once."""
+        tool = MockTool()
+        chunks = [chunk async for chunk in tool.execute_stream(input="test")]
+
+        assert len(chunks) == 1
+        assert "input=test" in chunks[0]
+
 
 @pytest.mark.unit
 class TestToolRegistry:
@@ -194,6 +194,82 @@ class TestFileReadTool:
         assert result.success is False
         assert result.is_validation_error is True
 
+    @staticmethod
+    def _stream_of(*chunks: bytes):
+        async def _stream(path, chunk_size=64 * 1024):
+            for chunk in chunks:
+                yield chunk
+
+        return _stream
+
+    @pytest.mark.asyncio
+    async def test_execute_stream_matches_execute(self, mock_container):
+        """Test streamed output equals execute() output for text files."""
+        content = "line1\nline2 \u00e9\nline3\n"
+        data = content.encode("utf-8")
+        # Split inside the multi-byte character and mid-line
+        mock_container.read_file_stream = self._stream_of(data[:3], data[3:12], data[12:])
+        mock_container.read_file.return_value = content
+        tool = FileReadTool(mock_container)
+
+        chunks = [c async for c in tool.execute_stream(path="/workspace/out/test.txt")]
+        result = await tool.execute(path="/workspace/out/test.txt")
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == result.output
+
+    @pytest.mark.asyncio
+    async def test_execute_stream_binary_falls_back(self, mock_container):
+        """Test binary files fall back to execute() output."""
+        mock_container.read_file_stream = self._stream_of(b"\x89PNG\xff\xfe")
+        mock_container.read_file.return_value = "data:image/png;base64,iVBORw0KGgo..."
+        tool = FileReadTool(mock_container)
+
+        chunks = [c async for c in tool.execute_stream(path="/workspace/out/plot.png")]
+
+        assert len(chunks) == 1
+        assert "Successfully read image file" in chunks[0]
+
+    @pytest.mark.asyncio
+    async def test_execute_stream_replaces_late_invalid_bytes(self, mock_container):
+        """Test undecodable bytes after the first chunk are replaced, not treated as binary."""
+        mock_container.read_file_stream = self._stream_of(b"line1\n", b"bad \xff\n")
+        tool = FileReadTool(mock_container)
+
+        chunks = [c async for c in tool.execute_stream(path="/workspace/out/mixed.txt")]
+
+        assert "".join(chunks) == "   1: line1\n   2: bad \ufffd\n   3: "
+
+    @pytest.mark.asyncio
+    async def test_execute_reads_text_from_stream(self, mock_container):
+        """Test execute() formats text files from the stream without a buffered read."""
+        mock_container.read_file_stream = self._stream_of(b"line1\nli", b"ne2")
+        tool = FileReadTool(mock_container)
+
+        result = await tool.execute(path="/workspace/out/test.txt")
+
+        assert result.success is True
+        assert result.output == "   1: line1\n   2: line2"
+        assert result.metadata["line_count"] == 2
+        assert result.metadata["size"] == 11
+        mock_container.read_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_stream_reports_late_read_error(self, mock_container):
+        """Test a read error after output has started ends the stream with an error."""
+
+        async def _failing_stream(path, chunk_size=64 * 1024):
+            yield b"line1\n"
+            raise OSError("connection reset")
+
+        mock_container.read_file_stream = _failing_stream
+        tool = FileReadTool(mock_container)
+
+        chunks = [c async for c in tool.execute_stream(path="/workspace/out/test.txt")]
+
+        assert chunks[0] == "   1: line1"
+        assert chunks[-1] == "\nError: Failed to read file: connection reset"
+
 
 @pytest.mark.unit
 class TestFileWriteTool:
@@ -244,6 +320,36 @@ class TestFileWriteTool:
         assert result.success is True
         assert result.metadata["size"] == 100
 
+    @pytest.mark.asyncio
+    async def test_write_identical_content_skipped(self, mock_container):
+        """Test writing unchanged content skips the container write."""
+        import hashlib
+
+        content = "print('Hello')"
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        mock_container.execute = AsyncMock(
+            return_value=(0, f"{digest}  /workspace/out/script.py\n", "")
+        )
+        tool = FileWriteTool(mock_container)
+
+        result = await tool.execute(filename="script.py", content=content)
+
+        assert result.success is True
+        assert result.metadata["skipped"] is True
+        mock_container.write_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_write_changed_content_written(self, mock_container):
+        """Test writing different content still writes the file."""
+        mock_container.execute = AsyncMock(return_value=(0, "0" * 64 + "  script.py\n", ""))
+        tool = FileWriteTool(mock_container)
+
+        result = await tool.execute(filename="script.py", content="print('new')")
+
+        assert result.success is True
+        assert "skipped" not in result.metadata
+        mock_container.write_file.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_write_file_failure(self, mock_container):
         """Test handling write failure."""
@@ -3,10 +3,13 @@
 import pytest
 from unittest.mock import AsyncMock
 
+from app.core.agent.tools import search_tool_unified
 from app.core.agent.tools.search_tool_unified import (
     UnifiedSearchTool,
     PATTERN_SHORTCUTS,
     LANGUAGE_ALIASES,
+    compile_content_pattern,
+    parse_literal_alternation,
 )
 from app.core.sandbox.container import SandboxContainer
 
@@ -125,6 +128,174 @@ class TestUnifiedSearchTool:
         assert result.success is True
         assert result.metadata["mode"] == "text"
 
+    def test_parse_literal_alternation(self):
+        """Test detection of fixed-string alternations in grep syntax."""
+        assert parse_literal_alternation("TODO\\|FIXME\\|XXX") == ("TODO", "FIXME", "XXX")
+        assert parse_literal_alternation("\\(foo\\|bar\\)") == ("foo", "bar")
+        assert parse_literal_alternation("a+b\\|c?") == ("a+b", "c?")
+        assert parse_literal_alternation("TODO") is None
+        assert parse_literal_alternation("cat | grep") is None
+        assert parse_literal_alternation("(?:foo|bar)") is None
+        assert parse_literal_alternation("foo.*\\|bar") is None
+        assert parse_literal_alternation("foo\\|\\|bar") is None
+
+    def test_compile_content_pattern_keeps_grep_semantics(self):
+        """Test a plain '|' is matched literally, as grep does."""
+        regex = compile_content_pattern("cat | grep")
+
+        assert regex.search(b"ls | cat | grep x")
+        assert not regex.search(b"cat file")
+        assert compile_content_pattern("fo.*o") is None
+
+    @pytest.mark.asyncio
+    async def test_search_text_literal_alternation_uses_fixed_strings(self, mock_container):
+        """Test literal alternations are searched with grep -F."""
+        mock_container.execute.side_effect = [
+            (0, "exists", ""),  # Path check
+            (0, "/workspace/out/file.py", ""),  # grep result
+            (0, "5:TODO: fix this", ""),  # context
+        ]
+        tool = UnifiedSearchTool(mock_container)
+
+        result = await tool.execute(query="TODO\\|FIXME", path="/workspace/out")
+
+        assert result.success is True
+        grep_cmd = mock_container.execute.call_args_list[1].args[0]
+        assert "grep -rl -F -e 'TODO' -e 'FIXME'" in grep_cmd
+
+    @pytest.mark.asyncio
+    async def test_search_text_pipe_is_literal(self, mock_container):
+        """Test a plain '|' is passed to grep unchanged rather than split."""
+        mock_container.execute.side_effect = [
+            (0, "exists", ""),  # Path check
+            (1, "", ""),  # grep - no matches
+        ]
+        tool = UnifiedSearchTool(mock_container)
+
+        await tool.execute(query="TODO|FIXME", path="/workspace/out")
+
+        grep_cmd = mock_container.execute.call_args_list[1].args[0]
+        assert "grep -rl 'TODO|FIXME'" in grep_cmd
+
+    @pytest.mark.asyncio
+    async def test_search_text_local_scan(self, mock_docker_container, tmp_path):
+        """Test text search scans a bind-mounted workspace in-process."""
+        out_dir = tmp_path / "out"
+        (out_dir / "pkg").mkdir(parents=True)
+        (out_dir / "pkg" / "a.py").write_text("x = 1\n# TODO: one\ny = 2  # FIXME\n")
+        (out_dir / "b.txt").write_text("nothing here\n")
+        (out_dir / "empty.py").write_text("")
+
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(tmp_path))
+        container.execute = AsyncMock(return_value=(0, "exists", ""))
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="TODO\\|FIXME", path="/workspace/out")
+
+        assert result.success is True
+        assert result.metadata["matches"] == 1
+        assert "📄 /workspace/out/pkg/a.py" in result.output
+        assert "2:# TODO: one" in result.output
+        assert "3:y = 2  # FIXME" in result.output
+        # Only the path check ran in the container
+        assert container.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_search_text_local_scan_skips_symlinks(self, mock_docker_container, tmp_path):
+        """Test the in-process scan never follows symlinks out of the workspace."""
+        secret = tmp_path / "host_only.txt"
+        secret.write_text("TODO=HOSTSECRET\n")
+        workspace = tmp_path / "ws"
+        out_dir = workspace / "out"
+        out_dir.mkdir(parents=True)
+        (out_dir / "link").symlink_to(secret)
+        (out_dir / "linked_dir").symlink_to(tmp_path, target_is_directory=True)
+        (out_dir / "real.txt").write_text("TODO: mine\n")
+
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(workspace))
+        container.execute = AsyncMock(return_value=(0, "exists", ""))
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="TODO", path="/workspace/out")
+
+        assert result.metadata["matches"] == 1
+        assert "📄 /workspace/out/real.txt" in result.output
+        assert "HOSTSECRET" not in result.output
+
+    @pytest.mark.asyncio
+    async def test_search_text_symlinked_path_falls_back_to_grep(
+        self, mock_docker_container, tmp_path
+    ):
+        """Test a search path that resolves outside the workspace is not scanned on the host."""
+        (tmp_path / "host").mkdir()
+        (tmp_path / "host" / "secret.txt").write_text("TODO=HOSTSECRET\n")
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        (workspace / "out").symlink_to(tmp_path / "host", target_is_directory=True)
+
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(workspace))
+        container.execute = AsyncMock(side_effect=[(0, "exists", ""), (1, "", "")])
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="TODO", path="/workspace/out")
+
+        assert "HOSTSECRET" not in result.output
+        assert container.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_text_workspace_root_uses_grep(self, mock_docker_container, tmp_path):
+        """Test searching /workspace uses grep so the project_files volume is included."""
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out" / "a.py").write_text("TODO\n")
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(tmp_path))
+        container.execute = AsyncMock(
+            side_effect=[
+                (0, "exists", ""),
+                (0, "/workspace/project_files/data.txt", ""),
+                (0, "1:TODO", ""),
+            ]
+        )
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="TODO", path="/workspace")
+
+        assert "📄 /workspace/project_files/data.txt" in result.output
+        assert container.execute.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_search_text_local_scan_skips_large_files(
+        self, mock_docker_container, tmp_path, monkeypatch
+    ):
+        """Test files over the scan size limit are not read."""
+        monkeypatch.setattr(search_tool_unified, "MAX_SCAN_FILE_BYTES", 64)
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+        (out_dir / "big.txt").write_text("TODO\n" + "x" * 100)
+        (out_dir / "small.txt").write_text("TODO\n")
+
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(tmp_path))
+        container.execute = AsyncMock(return_value=(0, "exists", ""))
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="TODO", path="/workspace/out")
+
+        assert result.metadata["matches"] == 1
+        assert "📄 /workspace/out/small.txt" in result.output
+
+    @pytest.mark.asyncio
+    async def test_search_text_regex_falls_back_to_grep(self, mock_docker_container, tmp_path):
+        """Test regex queries still use grep even when a host path exists."""
+        container = SandboxContainer(mock_docker_container, "/tmp/ws", host_path=str(tmp_path))
+        container.execute = AsyncMock(
+            side_effect=[(0, "exists", ""), (0, "/workspace/out/a.py", ""), (0, "1:foo", "")]
+        )
+        tool = UnifiedSearchTool(container)
+
+        result = await tool.execute(query="fo.*o", path="/workspace/out")
+
+        assert result.success is True
+        assert container.execute.call_count == 3
+
     @pytest.mark.asyncio
     async def test_search_text_no_matches(self, mock_container):
         """Test text search with no matches."""
@@ -154,6 +325,21 @@ class TestUnifiedSearchTool:
         assert result.metadata["mode"] == "filename"
         assert result.metadata["matches"] == 2
 
+    @pytest.mark.asyncio
+    async def test_search_filename_strips_query(self, mock_container):
+        """Test surrounding whitespace in a filename query is ignored."""
+        mock_container.execute.side_effect = [
+            (0, "exists", ""),  # Path check
+            (0, "/workspace/out/script.py", ""),  # find result
+        ]
+        tool = UnifiedSearchTool(mock_container)
+
+        result = await tool.execute(query="  *.py ", mode="filename", path="/workspace/out")
+
+        find_cmd = mock_container.execute.call_args_list[1][0][0]
+        assert "-name '*.py'" in find_cmd
+        assert result.metadata["matches"] == 1
+
     @pytest.mark.asyncio
     async def test_search_filename_no_matches(self, mock_container):
         """Test filename search with no matches."""
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.core.llm.provider import (
     LLMProvider,
+    _PROVIDER_CACHE,
     create_llm_provider,
     create_llm_provider_with_db,
 )
@@ -38,18 +39,29 @@ class TestLLMProvider:
         assert provider.api_key == "test-key"
         assert provider.config["temperature"] == 0.7
 
-    def test_set_api_key_openai(self):
-        """Test setting OpenAI API key in environment."""
+    @pytest.mark.asyncio
+    async def test_api_key_passed_per_call(self):
+        """Test API key is passed to LiteLLM per call instead of via the environment."""
         with patch.dict(os.environ, {}, clear=True):
-            _provider = LLMProvider(provider="openai", api_key="sk-test-key")
-            # API key should be set in environment
-            assert os.environ.get("OPENAI_API_KEY") == "sk-test-key"
+            provider = LLMProvider(provider="anthropic", api_key="sk-ant-test-key")
+            assert "ANTHROPIC_API_KEY" not in os.environ
 
-    def test_set_api_key_anthropic(self):
-        """Test setting Anthropic API key in environment."""
-        with patch.dict(os.environ, {}, clear=True):
-            _provider = LLMProvider(provider="anthropic", api_key="sk-ant-test-key")
-            assert os.environ.get("ANTHROPIC_API_KEY") == "sk-ant-test-key"
+            with patch(
+                "app.core.llm.provider.acompletion", new_callable=AsyncMock
+            ) as mock_acompletion:
+                await provider.generate(messages=[{"role": "user", "content": "Hello"}])
+
+            assert mock_acompletion.call_args.kwargs["api_key"] == "sk-ant-test-key"
+
+    @pytest.mark.asyncio
+    async def test_no_api_key_param_without_key(self):
+        """Test LiteLLM falls back to its own key lookup when no key is given."""
+        provider = LLMProvider(provider="openai")
+
+        with patch("app.core.llm.provider.acompletion", new_callable=AsyncMock) as mock_acompletion:
+            await provider.generate(messages=[{"role": "user", "content": "Hello"}])
+
+        assert "api_key" not in mock_acompletion.call_args.kwargs
 
     def test_build_model_name_openai(self):
         """Test building model name for OpenAI."""
@@ -165,6 +177,21 @@ class TestLLMProvider:
             assert "function_call" in chunks[0]
             assert chunks[0]["function_call"]["name"] == "test_tool"
 
+    @pytest.mark.asyncio
+    async def test_generate_merges_overrides_without_mutating_config(self):
+        """Test per-call kwargs override config without changing the base parameters."""
+        provider = LLMProvider(temperature=0.5, max_tokens=100)
+
+        with patch("app.core.llm.provider.acompletion", new_callable=AsyncMock) as mock_acompletion:
+            await provider.generate(messages=[{"role": "user", "content": "Hi"}], temperature=0.9)
+            assert mock_acompletion.call_args.kwargs["temperature"] == 0.9
+            assert mock_acompletion.call_args.kwargs["max_tokens"] == 100
+
+            await provider.generate(messages=[{"role": "user", "content": "Hi"}])
+            assert mock_acompletion.call_args.kwargs["temperature"] == 0.5
+
+        assert provider.config == {"temperature": 0.5, "max_tokens": 100}
+
 
 @pytest.mark.unit
 class TestCreateLLMProvider:
@@ -187,6 +214,42 @@ class TestCreateLLMProvider:
 
         assert provider.api_key is None
 
+    def test_create_llm_provider_reuses_instance(self):
+        """Test identical arguments return the cached provider instance."""
+        first = create_llm_provider("openai", "gpt-4o", {"temperature": 0.5, "top_p": 1}, "key-a")
+        second = create_llm_provider("openai", "gpt-4o", {"top_p": 1, "temperature": 0.5}, "key-a")
+        other_key = create_llm_provider(
+            "openai", "gpt-4o", {"temperature": 0.5, "top_p": 1}, "key-b"
+        )
+
+        assert first is second
+        assert other_key is not first
+        assert other_key.api_key == "key-b"
+
+    def test_create_llm_provider_cache_keys_omit_api_key(self):
+        """Test the provider cache is not keyed on the raw API key."""
+        create_llm_provider("openai", "gpt-4o", {}, "secret-key-value")
+
+        assert _PROVIDER_CACHE
+        assert all("secret-key-value" not in key for key in _PROVIDER_CACHE)
+
+    def test_create_llm_provider_constructor_errors_propagate(self):
+        """Test TypeErrors raised while building a provider are not swallowed."""
+        with patch(
+            "app.core.llm.provider.LLMProvider.__init__", side_effect=TypeError("bad config")
+        ):
+            with pytest.raises(TypeError, match="bad config"):
+                create_llm_provider("openai", "gpt-4o", {"seed": 7}, "key-c")
+
+    def test_create_llm_provider_unhashable_config(self):
+        """Test configs with unhashable values bypass the cache."""
+        config = {"metadata": {"user": "test"}}
+        first = create_llm_provider("openai", "gpt-4o", config)
+        second = create_llm_provider("openai", "gpt-4o", config)
+
+        assert first is not second
+        assert first.config["metadata"] == {"user": "test"}
+
 
 @pytest.mark.unit
 class TestCreateLLMProviderWithDB:
@@ -20,6 +20,31 @@ class TestSandboxContainer:
         assert container.workspace_path == "/tmp/test_workspace"
         assert container.container_id == mock_docker_container.id
 
+    def test_get_host_path(self, mock_docker_container):
+        """Test mapping container paths onto a bind-mounted host directory."""
+        container = SandboxContainer(mock_docker_container, "N/A", host_path="/srv/ws")
+
+        assert container.get_host_path("/workspace") == "/srv/ws"
+        assert container.get_host_path("/workspace/out/a.py") == "/srv/ws/out/a.py"
+        assert container.get_host_path("/workspace/project_files/data.csv") is None
+        assert container.get_host_path("/etc/passwd") is None
+        assert container.get_host_path("/workspace/../etc") is None
+
+    def test_get_host_tree(self, mock_docker_container):
+        """Test directories containing a separate volume have no host tree."""
+        container = SandboxContainer(mock_docker_container, "N/A", host_path="/srv/ws")
+
+        assert container.get_host_tree("/workspace/out") == "/srv/ws/out"
+        assert container.get_host_tree("/workspace") is None
+        assert container.get_host_tree("/workspace/") is None
+        assert container.get_host_tree("/workspace/project_files") is None
+
+    def test_get_host_path_without_bind_mount(self, mock_docker_container):
+        """Test no host path is returned when the workspace is not bind-mounted."""
+        container = SandboxContainer(mock_docker_container, "volume://abc")
+
+        assert container.get_host_path("/workspace/out") is None
+
     def test_is_running_true(self, mock_docker_container):
         """Test is_running returns True when container is running."""
         mock_docker_container.status = "running"
@@ -144,6 +169,71 @@ class TestSandboxContainer:
 
         assert result == "print('Hello, World!')"
 
+    @pytest.mark.asyncio
+    async def test_read_file_stream(self, mock_docker_container):
+        """Test streaming file content from a chunked archive."""
+        import io
+        import tarfile
+
+        content = b"x" * 10000
+        tar_bytes = io.BytesIO()
+        with tarfile.open(fileobj=tar_bytes, mode="w") as tar:
+            tarinfo = tarfile.TarInfo(name="big.txt")
+            tarinfo.size = len(content)
+            tar.addfile(tarinfo, io.BytesIO(content))
+        archive = tar_bytes.getvalue()
+
+        def get_archive_mock(path, chunk_size=None):
+            return iter(archive[i : i + 777] for i in range(0, len(archive), 777)), {}
+
+        mock_docker_container.get_archive = get_archive_mock
+        container = SandboxContainer(mock_docker_container, "/tmp/ws")
+
+        chunks = [
+            c async for c in container.read_file_stream("/workspace/out/big.txt", chunk_size=4096)
+        ]
+
+        assert b"".join(chunks) == content
+        assert all(len(c) <= 4096 for c in chunks)
+
+    @pytest.mark.asyncio
+    async def test_read_file_stream_closes_archive_on_early_stop(self, mock_docker_container):
+        """Test the archive stream is closed when the consumer stops reading."""
+        import io
+        import tarfile
+
+        content = b"x" * 10000
+        tar_bytes = io.BytesIO()
+        with tarfile.open(fileobj=tar_bytes, mode="w") as tar:
+            tarinfo = tarfile.TarInfo(name="big.txt")
+            tarinfo.size = len(content)
+            tar.addfile(tarinfo, io.BytesIO(content))
+        archive = tar_bytes.getvalue()
+        closed = []
+
+        def bits():
+            try:
+                for i in range(0, len(archive), 777):
+                    yield archive[i : i + 777]
+            finally:
+                closed.append(True)
+
+        # Keep a reference so only an explicit close() runs the generator's finally
+        streams = []
+
+        def get_archive_mock(path, chunk_size=None):
+            streams.append(bits())
+            return streams[-1], {}
+
+        mock_docker_container.get_archive = get_archive_mock
+        container = SandboxContainer(mock_docker_container, "/tmp/ws")
+
+        stream = container.read_file_stream("/workspace/out/big.txt", chunk_size=1024)
+        assert await anext(stream) == content[:1024]
+        await stream.aclose()
+
+        assert closed == [True]
+
     @pytest.mark.asyncio
     async def test_read_file_not_found(self, mock_docker_container):
         """Test read_file raises exception for missing file."""
@@ -1,8 +1,14 @@
 """Tests for LocalStorage backend."""
 
+import errno
+import os
+import shutil
+from pathlib import Path
+
 import pytest
+from unittest.mock import MagicMock, patch
 
-from app.core.storage.local_storage import LocalStorage
+from app.core.storage.local_storage import LocalStorage, _compute_host_path, _copy_file
 
 
 @pytest.mark.unit
@@ -27,7 +33,7 @@ class TestLocalStorage:
     def test_get_workspace_path(self, storage, session_id):
         """Test getting workspace path for session."""
         path = storage._get_workspace_path(session_id)
-        assert path == storage.workspace_base / session_id
+        assert path == str(storage.workspace_base / session_id)
 
     def test_get_host_path(self, storage, session_id):
         """Test converting container path to host path."""
@@ -35,7 +41,7 @@ class TestLocalStorage:
         host_path = storage._get_host_path(session_id, container_path)
 
         expected = storage.workspace_base / session_id / "out" / "script.py"
-        assert host_path == expected
+        assert host_path == str(expected)
 
     def test_get_host_path_variations(self, storage, session_id):
         """Test various container path formats."""
@@ -43,19 +49,29 @@ class TestLocalStorage:
             ("/workspace/out/file.py", "out/file.py"),
             ("/workspace/project_files/data.csv", "project_files/data.csv"),
             ("/workspace/test.py", "test.py"),
+            ("/workspace//out/double.py", "out/double.py"),
         ]
 
         for container_path, expected_relative in test_cases:
             host_path = storage._get_host_path(session_id, container_path)
             expected = storage.workspace_base / session_id / expected_relative
-            assert host_path == expected
+            assert host_path == str(expected)
+
+    def test_get_host_path_cached(self, storage, session_id):
+        """Test that repeated lookups reuse the cached mapping."""
+        container_path = "/workspace/out/cached.py"
+        storage._get_host_path(session_id, container_path)
+        hits = _compute_host_path.cache_info().hits
+
+        storage._get_host_path(session_id, container_path)
+        assert _compute_host_path.cache_info().hits == hits + 1
 
     @pytest.mark.asyncio
     async def test_create_workspace(self, storage, session_id):
         """Test creating a workspace."""
         await storage.create_workspace(session_id)
 
-        workspace = storage._get_workspace_path(session_id)
+        workspace = Path(storage._get_workspace_path(session_id))
         assert workspace.exists()
         assert (workspace / "project_files").exists()
         assert (workspace / "out").exists()
@@ -88,14 +104,79 @@ class TestLocalStorage:
         assert success is True
 
         host_path = storage._get_host_path(session_id, container_path)
-        assert host_path.exists()
+        assert os.path.exists(host_path)
+
+    @pytest.mark.asyncio
+    async def test_write_file_overwrite_truncates(self, storage, session_id):
+        """Test that overwriting with shorter content truncates the file."""
+        container_path = "/workspace/out/data.txt"
+        await storage.write_file(session_id, container_path, b"long original content")
+        await storage.write_file(session_id, container_path, b"short")
+
+        assert await storage.read_file(session_id, container_path) == b"short"
+
+        await storage.write_file(session_id, container_path, b"")
+        assert await storage.read_file(session_id, container_path) == b""
+
+    @pytest.mark.asyncio
+    async def test_write_file_skips_mkdir_for_known_dir(self, storage, session_id):
+        """Test that parent directories are only created once."""
+        await storage.write_file(session_id, "/workspace/out/a.py", b"a")
+
+        with patch("app.core.storage.local_storage.os.makedirs") as mock_makedirs:
+            assert await storage.write_file(session_id, "/workspace/out/b.py", b"b") is True
+
+        mock_makedirs.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_write_file_after_delete_workspace(self, storage, session_id):
+        """Test that deleting a workspace invalidates cached directories."""
+        await storage.write_file(session_id, "/workspace/out/a.py", b"a")
+        await storage.delete_workspace(session_id)
+
+        assert await storage.write_file(session_id, "/workspace/out/a.py", b"again") is True
+        assert await storage.read_file(session_id, "/workspace/out/a.py") == b"again"
+
+    @pytest.mark.asyncio
+    async def test_write_file_after_external_rmtree(self, storage, session_id):
+        """Test that a cached directory removed outside LocalStorage is recreated."""
+        await storage.write_file(session_id, "/workspace/out/sub/a.py", b"a")
+        shutil.rmtree(storage._get_host_path(session_id, "/workspace/out/sub"))
+
+        assert await storage.write_file(session_id, "/workspace/out/sub/b.py", b"b") is True
+        assert await storage.read_file(session_id, "/workspace/out/sub/b.py") == b"b"
+
+    @pytest.mark.asyncio
+    async def test_copy_after_external_rmtree(self, storage, session_id, tmp_path):
+        """Test that copying into a cached directory removed outside LocalStorage recreates it."""
+        source = tmp_path / "upload"
+        (source / "nested").mkdir(parents=True)
+        (source / "nested" / "a.txt").write_bytes(b"a")
+        await storage.copy_to_workspace(session_id, source, "/workspace/project_files/upload")
+        shutil.rmtree(storage._get_host_path(session_id, "/workspace/project_files/upload"))
+
+        await storage.copy_to_workspace(session_id, source, "/workspace/project_files/upload")
+
+        assert (
+            await storage.read_file(session_id, "/workspace/project_files/upload/nested/a.txt")
+            == b"a"
+        )
+
+    def test_known_dirs_are_bounded(self, storage):
+        """Test that the directory cache is dropped instead of growing without limit."""
+        with patch("app.core.storage.local_storage._KNOWN_DIRS_MAX", 3):
+            for i in range(5):
+                storage._remember_dir(f"/dir{i}")
+
+        assert len(storage._known_dirs) <= 3
+        assert storage._is_known_dir("/dir4")
 
     @pytest.mark.asyncio
     async def test_read_file_not_found(self, storage, session_id):
         """Test reading non-existent file."""
         await storage.create_workspace(session_id)
 
-        with pytest.raises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError, match="/workspace/out/missing.py"):
             await storage.read_file(session_id, "/workspace/out/missing.py")
 
     @pytest.mark.asyncio
@@ -156,6 +237,46 @@ class TestLocalStorage:
         assert any("file2.py" in p for p in paths)
         assert any("file3.py" in p for p in paths)
 
+    @pytest.mark.asyncio
+    async def test_list_files_metadata(self, storage, session_id):
+        """Test listed entries carry container paths, sizes and directory flags."""
+        await storage.create_workspace(session_id)
+        await storage.write_file(session_id, "/workspace/out/a.txt", b"abc")
+        await storage.write_file(session_id, "/workspace/out/sub/b.txt", b"hello")
+
+        files = {f.path: f for f in await storage.list_files(session_id, "/workspace/out/")}
+
+        assert set(files) == {
+            "/workspace/out/a.txt",
+            "/workspace/out/sub",
+            "/workspace/out/sub/b.txt",
+        }
+        assert files["/workspace/out/a.txt"].size == 3
+        assert files["/workspace/out/sub"].is_dir is True
+        assert files["/workspace/out/sub/b.txt"].size == 5
+        assert files["/workspace/out/sub/b.txt"].is_dir is False
+
+    @pytest.mark.asyncio
+    async def test_list_files_matches_rglob(self, storage, session_id, tmp_path):
+        """Test listing keeps rglob's order and reports directory symlinks as directories."""
+        await storage.create_workspace(session_id)
+        for path in ["a/x.txt", "a/b/y.txt", "c/z.txt", "f.txt"]:
+            await storage.write_file(session_id, f"/workspace/out/{path}", b"data")
+        target = tmp_path / "linked"
+        target.mkdir()
+        (target / "inside.txt").write_text("x")
+        out_dir = Path(storage._get_host_path(session_id, "/workspace/out"))
+        (out_dir / "lnk").symlink_to(target, target_is_directory=True)
+
+        files = await storage.list_files(session_id, "/workspace/out")
+
+        expected = [
+            (f"/workspace/out/{item.relative_to(out_dir).as_posix()}", item.is_dir())
+            for item in out_dir.rglob("*")
+        ]
+        assert [(f.path, f.is_dir) for f in files] == expected
+        assert ("/workspace/out/lnk", True) in expected
+
     @pytest.mark.asyncio
     async def test_list_files_empty(self, storage, session_id):
         """Test listing files in empty directory."""
@@ -170,7 +291,7 @@ class TestLocalStorage:
         await storage.create_workspace(session_id)
         await storage.write_file(session_id, "/workspace/out/test.py", b"content")
 
-        workspace = storage._get_workspace_path(session_id)
+        workspace = Path(storage._get_workspace_path(session_id))
         assert workspace.exists()
 
         await storage.delete_workspace(session_id)
@@ -186,11 +307,122 @@ class TestLocalStorage:
 
         assert await storage.file_exists(session_id, dest_path)
 
+    @pytest.mark.asyncio
+    async def test_copy_directory_to_workspace(self, storage, session_id, tmp_path):
+        """Test copying a directory tree copies every nested file."""
+        source = tmp_path / "upload"
+        (source / "nested" / "deep").mkdir(parents=True)
+        (source / "top.txt").write_bytes(b"top")
+        (source / "nested" / "deep" / "leaf.txt").write_bytes(b"leaf")
+        (source / "empty_dir").mkdir()
+        await storage.create_workspace(session_id)
+
+        await storage.copy_to_workspace(session_id, source, "/workspace/project_files/upload")
+
+        assert await storage.read_file(session_id, "/workspace/project_files/upload/top.txt") == (
+            b"top"
+        )
+        assert (
+            await storage.read_file(
+                session_id, "/workspace/project_files/upload/nested/deep/leaf.txt"
+            )
+            == b"leaf"
+        )
+
+    @pytest.mark.asyncio
+    async def test_copy_directory_again_skips_mkdir(self, storage, session_id, tmp_path):
+        """Test that re-copying a tree does not recreate known directories."""
+        source = tmp_path / "upload"
+        (source / "nested").mkdir(parents=True)
+        (source / "nested" / "a.txt").write_bytes(b"a")
+        await storage.copy_to_workspace(session_id, source, "/workspace/project_files/upload")
+
+        with patch("app.core.storage.local_storage.os.makedirs") as mock_makedirs:
+            await storage.copy_to_workspace(session_id, source, "/workspace/project_files/upload")
+
+        mock_makedirs.assert_not_called()
+
+    def test_copy_file_large(self, tmp_path):
+        """Test _copy_file copies content larger than a single chunk."""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+
+        _copy_file(str(source), str(tmp_path / "copy.bin"))
+
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+    def test_copy_file_preserves_mode_and_mtime(self, tmp_path):
+        """Test _copy_file keeps the executable bit and modification time, like copy2."""
+        source = tmp_path / "run.sh"
+        source.write_bytes(b"#!/bin/sh\necho hi\n")
+        source.chmod(0o755)
+        os.utime(source, (1_000_000_000, 1_000_000_000))
+
+        _copy_file(str(source), str(tmp_path / "copy.sh"))
+
+        copied = (tmp_path / "copy.sh").stat()
+        assert copied.st_mode & 0o777 == 0o755
+        assert copied.st_mtime == 1_000_000_000
+
+    def test_copy_file_falls_back_when_unsupported(self, tmp_path):
+        """Test _copy_file falls back to shutil when copy_file_range is unsupported."""
+        source = tmp_path / "src.txt"
+        source.write_bytes(b"content")
+
+        with patch(
+            "app.core.storage.local_storage.os.copy_file_range",
+            side_effect=OSError(errno.EXDEV, "cross-device"),
+            create=True,
+        ):
+            _copy_file(str(source), str(tmp_path / "dst.txt"))
+
+        assert (tmp_path / "dst.txt").read_bytes() == b"content"
+
+    @pytest.mark.asyncio
+    async def test_copy_directory_uses_robocopy_on_windows(self, storage, session_id, tmp_path):
+        """Test directory copies are delegated to robocopy on Windows."""
+        source = tmp_path / "upload"
+        source.mkdir()
+        (source / "a.txt").write_bytes(b"a")
+
+        with (
+            patch("app.core.storage.local_storage._IS_WINDOWS", True),
+            patch(
+                "app.core.storage.local_storage.subprocess.run",
+                return_value=MagicMock(returncode=1, stdout=""),
+            ) as mock_run,
+        ):
+            await storage.copy_to_workspace(session_id, source, "/workspace/project_files/up")
+
+        args = mock_run.call_args.args[0]
+        assert args[:3] == [
+            "robocopy",
+            str(source),
+            storage._get_host_path(session_id, "/workspace/project_files/up"),
+        ]
+        assert "/E" in args
+
+    @pytest.mark.asyncio
+    async def test_robocopy_failure_raises(self, storage, session_id, tmp_path):
+        """Test robocopy exit codes of 8 or more raise an error."""
+        source = tmp_path / "upload"
+        source.mkdir()
+
+        with (
+            patch("app.core.storage.local_storage._IS_WINDOWS", True),
+            patch(
+                "app.core.storage.local_storage.subprocess.run",
+                return_value=MagicMock(returncode=8, stdout="ERROR"),
+            ),
+        ):
+            with pytest.raises(OSError):
+                await storage.copy_to_workspace(session_id, source, "/workspace/project_files/up")
+
     def test_get_volume_config(self, storage, session_id):
         """Test getting Docker volume configuration."""
         config = storage.get_volume_config(session_id)
 
-        workspace_path = storage._get_workspace_path(session_id)
+        workspace_path = Path(storage._get_workspace_path(session_id))
         expected_key = str(workspace_path.absolute())
 
         assert expected_key in config
@@ -47,6 +47,8 @@ class TestAgentConfigurationModel:
         assert config.llm_provider == "openai"
         assert config.llm_model == "gpt-4"
         assert config.system_instructions is None
+        assert config.enabled_tools == []
+        assert config.llm_config == {}
 
     @pytest.mark.asyncio
     async def test_enabled_tools_json(self, db_session, sample_project):
@@ -99,17 +101,6 @@ class TestAgentConfigurationModel:
         assert config.project.id == sample_project.id
         assert config.project.name == sample_project.name
 
-    @pytest.mark.asyncio
-    async def test_update_agent_config(self, db_session, sample_agent_config):
-        """Test updating an agent configuration."""
-        sample_agent_config.llm_model = "gpt-4"
-        sample_agent_config.llm_config = {"temperature": 0.5}
-        await db_session.commit()
-        await db_session.refresh(sample_agent_config)
-
-        assert sample_agent_config.llm_model == "gpt-4"
-        assert sample_agent_config.llm_config["temperature"] == 0.5
-
     @pytest.mark.asyncio
     async def test_system_instructions(self, db_session, sample_project):
         """Test system instructions field."""
@@ -172,3 +163,19 @@ class TestAgentConfigurationModel:
 
             assert config.llm_provider == provider
             assert config.llm_model == model
+
+
+@pytest.mark.unit
+class TestAgentConfigurationUpdate:
+    """Test cases for updating an existing AgentConfiguration."""
+
+    @pytest.mark.asyncio
+    async def test_update_agent_config(self, db_session, sample_agent_config):
+        """Test updating an agent configuration."""
+        sample_agent_config.llm_model = "gpt-4"
+        sample_agent_config.llm_config = {"temperature": 0.5}
+        await db_session.commit()
+        await db_session.refresh(sample_agent_config)
+
+        assert sample_agent_config.llm_model == "gpt-4"
+        assert sample_agent_config.llm_config["temperature"] == 0.5
@@ -128,7 +128,10 @@ class TestChatSessionModel:
         db_session.add_all(sessions)
         await db_session.commit()
 
-        query = select(ChatSession).where(ChatSession.project_id == sample_project.id)
+        # Skip the sample session other tests in the class may share
+        query = select(ChatSession).where(
+            ChatSession.project_id == sample_project.id, ChatSession.name.like("Session %")
+        )
         result = await db_session.execute(query)
         all_sessions = result.scalars().all()
 
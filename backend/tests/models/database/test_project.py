@@ -111,7 +111,8 @@ class TestProjectModel:
         db_session.add_all(projects)
         await db_session.commit()
 
-        query = select(Project)
+        # Skip the sample project other tests in the class may share
+        query = select(Project).where(Project.name.like("Project %"))
         result = await db_session.execute(query)
         all_projects = result.scalars().all()
 
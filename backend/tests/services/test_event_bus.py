@@ -2,6 +2,8 @@
 
 import pytest
 import asyncio
+import json
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, AsyncMock
 
 from app.services.event_bus import (
@@ -61,6 +63,37 @@ class TestEventData:
 
         assert data.source == "agent"
 
+    def test_timestamp_is_epoch_ns(self):
+        """Test timestamps are integer nanoseconds formatted only on demand."""
+        data = EventData(
+            event_type=StreamingEvent.START, payload={}, timestamp=1_700_000_000 * 10**9
+        )
+
+        assert isinstance(EventData(event_type=StreamingEvent.START, payload={}).timestamp, int)
+        assert data.iso_timestamp == "2023-11-14T22:13:20+00:00"
+
+    def test_event_data_uses_slots(self):
+        """Test EventData instances carry no per-instance __dict__."""
+        data = EventData(event_type=StreamingEvent.CHUNK, payload={})
+
+        assert not hasattr(data, "__dict__")
+
+    def test_encoded_is_computed_once(self):
+        """Test the wire encoding is cached on the event."""
+        data = EventData(event_type=StreamingEvent.CHUNK, payload={"content": "test"})
+
+        encoded = data.encoded
+
+        assert json.loads(encoded) == {"type": "streaming.chunk", "data": {"content": "test"}}
+        assert data.encoded is encoded
+
+    def test_encoded_formats_datetimes_as_iso(self):
+        """Test datetimes in payloads are encoded as ISO 8601."""
+        stamp = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        data = EventData(event_type=StreamingEvent.END, payload={"at": stamp})
+
+        assert json.loads(data.encoded)["data"]["at"] == "2024-01-02T03:04:05+00:00"
+
 
 @pytest.mark.unit
 class TestEventBus:
@@ -71,7 +104,7 @@ class TestEventBus:
         bus = EventBus()
 
         assert bus._subscribers == {}
-        assert bus._processing is False
+        assert bus._dispatcher_task is None
         assert len(bus._event_history) == 0
 
     def test_subscribe(self):
@@ -109,6 +142,36 @@ class TestEventBus:
         assert handlers[0][0] == 10  # priority
         assert handlers[1][0] == 1
 
+    def test_subscribe_equal_priority_keeps_subscription_order(self):
+        """Test that handlers with equal priority run in subscription order."""
+        bus = EventBus()
+        first = MagicMock(__name__="first")
+        second = MagicMock(__name__="second")
+        high = MagicMock(__name__="high")
+
+        bus.subscribe(StreamingEvent.START, first, priority=5)
+        bus.subscribe(StreamingEvent.START, second, priority=5)
+        bus.subscribe(StreamingEvent.START, high, priority=10)
+
+        handlers = [h for _, h, *_ in bus._subscribers[StreamingEvent.START]]
+        assert handlers == [high, first, second]
+
+    def test_subscribe_records_coroutine_flag(self):
+        """Test that subscribe resolves whether each handler is a coroutine function."""
+        bus = EventBus()
+
+        async def async_handler(payload):
+            pass
+
+        def sync_handler(payload):
+            pass
+
+        bus.subscribe(StreamingEvent.START, async_handler)
+        bus.subscribe(StreamingEvent.END, sync_handler)
+
+        assert bus._subscribers[StreamingEvent.START][0][2] is True
+        assert bus._subscribers[StreamingEvent.END][0][2] is False
+
     def test_unsubscribe(self):
         """Test unsubscribing from an event."""
         bus = EventBus()
@@ -171,6 +234,146 @@ class TestEventBus:
 
         handler.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_emit_dispatches_inline(self):
+        """Test that handlers have run by the time emit returns."""
+        bus = EventBus()
+        handler = AsyncMock()
+
+        bus.subscribe(StreamingEvent.CHUNK, handler)
+        await bus.emit(StreamingEvent.CHUNK, {"content": "test"})
+
+        handler.assert_called_once()
+        assert bus._event_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_emit_passes_payload_unchanged(self):
+        """Test that the payload dict reaches handlers without wrapping or copying."""
+        bus = EventBus()
+        handler = AsyncMock()
+        payload = {"content": "raw chunk"}
+
+        bus.subscribe(StreamingEvent.CHUNK, handler)
+        await bus.emit(StreamingEvent.CHUNK, payload)
+
+        assert handler.call_args[0][0] is payload
+
+    @pytest.mark.asyncio
+    async def test_reentrant_emit_runs_after_current_dispatch(self):
+        """Test that an emit from inside a handler is queued, preserving order."""
+        bus = EventBus()
+        calls = []
+
+        async def handler(payload):
+            calls.append(("start", payload["n"]))
+            if payload["n"] == 1:
+                await bus.emit(StreamingEvent.CHUNK, {"n": 2})
+            calls.append(("end", payload["n"]))
+
+        bus.subscribe(StreamingEvent.CHUNK, handler)
+        await bus.emit(StreamingEvent.CHUNK, {"n": 1})
+        await asyncio.sleep(0.05)
+
+        assert calls == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_emits_are_not_reentrant(self):
+        """Test an emit from another coroutine is not queued behind a running dispatch."""
+        bus = EventBus()
+        calls = []
+        gate = asyncio.Event()
+        a_done = asyncio.Event()
+
+        async def handler(payload):
+            calls.append(("start", payload["s"], payload["n"]))
+            if payload["s"] == "A":
+                await gate.wait()
+            elif payload["n"] == 0:
+                await asyncio.sleep(0.02)
+            calls.append(("end", payload["s"], payload["n"]))
+
+        async def session_a():
+            await bus.emit(StreamingEvent.CHUNK, {"s": "A", "n": 0})
+            a_done.set()
+
+        async def session_b():
+            await asyncio.sleep(0)  # Let A's handler start first
+            await bus.emit(StreamingEvent.CHUNK, {"s": "B", "n": 0})
+            gate.set()
+            await a_done.wait()
+            await bus.emit(StreamingEvent.CHUNK, {"s": "B", "n": 1})
+
+        bus.subscribe(StreamingEvent.CHUNK, handler)
+        await asyncio.gather(session_a(), session_b())
+        await bus.aclose()
+
+        b_calls = [c for c in calls if c[1] == "B"]
+        assert b_calls == [("start", "B", 0), ("end", "B", 0), ("start", "B", 1), ("end", "B", 1)]
+        assert bus._dispatcher_task is None
+
+    @pytest.mark.asyncio
+    async def test_dispatcher_does_not_inherit_reentrancy(self):
+        """Test the dispatcher does not treat the event that started it as still emitting."""
+        bus = EventBus()
+        calls = []
+
+        async def on_chunk(payload):
+            calls.append(("chunk", payload["n"]))
+            if payload["n"] == 0:
+                await bus.emit(StreamingEvent.CHUNK, {"n": 1})  # Starts the dispatcher
+
+        async def on_end(payload):
+            if payload["n"] == 0:
+                await bus.emit(StreamingEvent.END, {"n": 1})  # Queued for the dispatcher
+            else:
+                # Not reentrant for CHUNK, so it should run inline
+                await bus.emit(StreamingEvent.CHUNK, {"n": 2})
+                calls.append(("after", 2))
+
+        bus.subscribe(StreamingEvent.CHUNK, on_chunk)
+        bus.subscribe(StreamingEvent.END, on_end)
+        await bus.emit(StreamingEvent.CHUNK, {"n": 0})
+        await asyncio.sleep(0.01)
+        await bus.emit(StreamingEvent.END, {"n": 0})
+        await bus.aclose()
+
+        assert calls == [("chunk", 0), ("chunk", 1), ("chunk", 2), ("after", 2)]
+
+    @pytest.mark.asyncio
+    async def test_reentrant_emits_share_one_dispatcher(self):
+        """Test queued events reuse a single long-lived dispatcher task."""
+        bus = EventBus()
+        seen = []
+        tasks = set()
+
+        async def handler(payload):
+            seen.append(payload["n"])
+            if payload["n"] < 3:
+                await bus.emit(StreamingEvent.CHUNK, {"n": payload["n"] + 1})
+                tasks.add(bus._dispatcher_task)
+
+        bus.subscribe(StreamingEvent.CHUNK, handler)
+        await bus.emit(StreamingEvent.CHUNK, {"n": 1})
+        await bus.emit(StreamingEvent.CHUNK, {"n": 1})
+        await bus.aclose()
+
+        assert sorted(seen) == [1, 1, 2, 2, 3, 3]
+        assert len(tasks) == 1
+        assert bus._dispatcher_task is None
+
+    @pytest.mark.asyncio
+    async def test_emit_handler_error_does_not_stop_others(self):
+        """Test that a failing handler does not prevent later handlers."""
+        bus = EventBus()
+        failing = AsyncMock(side_effect=RuntimeError("boom"), __name__="failing")
+        handler = AsyncMock()
+
+        bus.subscribe(StreamingEvent.END, failing, priority=10)
+        bus.subscribe(StreamingEvent.END, handler)
+        await bus.emit(StreamingEvent.END, {})
+
+        handler.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_emit_adds_to_history(self):
         """Test that emit adds to event history."""
@@ -218,6 +421,28 @@ class TestEventBus:
         # Should return last 5
         assert history[-1].payload["index"] == 9
 
+    def test_history_evicts_oldest(self):
+        """Test that history keeps only the most recent events."""
+        bus = EventBus()
+
+        for i in range(bus._max_history_size + 5):
+            bus._add_to_history(EventData(event_type=StreamingEvent.CHUNK, payload={"index": i}))
+
+        history = bus.get_history(limit=bus._max_history_size + 5)
+        assert len(history) == bus._max_history_size
+        assert history[0].payload["index"] == 5
+
+    def test_get_history_filtered_with_limit(self):
+        """Test that filtered history returns the latest matching events in order."""
+        bus = EventBus()
+
+        for i in range(6):
+            event_type = StreamingEvent.CHUNK if i % 2 else StreamingEvent.START
+            bus._add_to_history(EventData(event_type=event_type, payload={"index": i}))
+
+        history = bus.get_history(event_type=StreamingEvent.CHUNK, limit=2)
+        assert [e.payload["index"] for e in history] == [3, 5]
+
     def test_clear_history(self):
         """Test clearing event history."""
         bus = EventBus()
@@ -226,6 +451,7 @@ class TestEventBus:
 
         bus.clear_history()
         assert len(bus._event_history) == 0
+        assert bus.get_history(event_type=StreamingEvent.START) == []
 
     def test_get_subscriber_count(self):
         """Test getting subscriber count."""
@@ -242,6 +468,73 @@ class TestEventBus:
         assert bus.get_subscriber_count(StreamingEvent.START) == 2
         assert bus.get_subscriber_count(StreamingEvent.END) == 1
 
+    def test_get_subscriber_count_after_unsubscribe_and_reset(self):
+        """Test that the total count tracks unsubscribe and reset."""
+        bus = EventBus()
+        handler = MagicMock(__name__="h1")
+
+        bus.subscribe(StreamingEvent.START, handler)
+        bus.subscribe(StreamingEvent.END, MagicMock(__name__="h2"))
+        bus.unsubscribe(StreamingEvent.START, handler)
+        bus.unsubscribe(StreamingEvent.START, handler)
+
+        assert bus.get_subscriber_count() == 1
+
+        bus.reset()
+        assert bus.get_subscriber_count() == 0
+
+    def test_has_subscribers(self):
+        """Test has_subscribers reflects handlers."""
+        bus = EventBus()
+
+        assert bus.has_subscribers(StreamingEvent.START) is False
+
+        bus.subscribe(StreamingEvent.START, MagicMock(__name__="h1"))
+
+        assert bus.has_subscribers(StreamingEvent.START) is True
+        assert bus.has_subscribers(StreamingEvent.END) is False
+
+    @pytest.mark.asyncio
+    async def test_with_event_handlers_share_encoding(self):
+        """Test with_event handlers receive the same EventData."""
+        bus = EventBus()
+        received = []
+        bus.subscribe(StreamingEvent.CHUNK, received.append, with_event=True)
+        bus.subscribe(StreamingEvent.CHUNK, received.append, with_event=True)
+        plain = MagicMock(__name__="plain")
+        bus.subscribe(StreamingEvent.CHUNK, plain)
+
+        await bus.emit(StreamingEvent.CHUNK, {"content": "hi"})
+
+        assert received[0] is received[1]
+        assert received[0].encoded is received[1].encoded
+        plain.assert_called_once_with({"content": "hi"})
+
+    @pytest.mark.asyncio
+    async def test_emit_lazy_payload_without_subscribers(self):
+        """Test a payload factory is not invoked when nothing listens."""
+        bus = EventBus()
+        factory = MagicMock(return_value={"key": "value"})
+
+        await bus.emit(StreamingEvent.START, factory)
+
+        factory.assert_not_called()
+        history = bus.get_history()
+        assert len(history) == 1
+        assert history[0].payload is None
+
+    @pytest.mark.asyncio
+    async def test_emit_lazy_payload_with_subscribers(self):
+        """Test a payload factory is resolved before dispatch."""
+        bus = EventBus()
+        handler = AsyncMock(__name__="handler")
+        bus.subscribe(StreamingEvent.START, handler)
+
+        await bus.emit(StreamingEvent.START, lambda: {"key": "value"})
+
+        handler.assert_called_once_with({"key": "value"})
+        assert bus.get_history()[0].payload == {"key": "value"}
+
     @pytest.mark.asyncio
     async def test_wait_for_event(self):
         """Test waiting for an event."""
@@ -267,6 +560,58 @@ class TestEventBus:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_wait_for_event_shares_one_future(self):
+        """Test concurrent waiters share a future instead of subscribing."""
+        bus = EventBus()
+
+        waiters = [
+            asyncio.create_task(bus.wait_for_event(StreamingEvent.END, timeout=1.0))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        assert len(bus._waiters) == 1
+        assert bus.get_subscriber_count(StreamingEvent.END) == 0
+
+        await bus.emit(StreamingEvent.END, {"status": "done"})
+        results = await asyncio.gather(*waiters)
+
+        assert all(r is results[0] for r in results)
+        assert results[0].payload == {"status": "done"}
+        assert bus._waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_for_event_timeout_keeps_other_waiters(self):
+        """Test one waiter timing out does not cancel the shared future."""
+        bus = EventBus()
+
+        patient = asyncio.create_task(bus.wait_for_event(StreamingEvent.END, timeout=1.0))
+        assert await bus.wait_for_event(StreamingEvent.END, timeout=0.05) is None
+
+        await bus.emit(StreamingEvent.END, {"status": "done"})
+        result = await patient
+
+        assert result is not None
+        assert result.event_type == StreamingEvent.END
+
+    @pytest.mark.asyncio
+    async def test_wait_for_event_timeout_drops_unused_future(self):
+        """Test the shared future is dropped once every waiter has timed out."""
+        bus = EventBus()
+
+        waiters = [
+            asyncio.create_task(bus.wait_for_event(StreamingEvent.END, timeout=t))
+            for t in (0.02, 0.05)
+        ]
+        await asyncio.sleep(0.03)
+        assert bus.has_subscribers(StreamingEvent.END) is True
+
+        assert await asyncio.gather(*waiters) == [None, None]
+        assert bus._waiters == {}
+        assert bus._waiter_counts == {}
+        assert bus.has_subscribers(StreamingEvent.END) is False
+
     def test_reset(self):
         """Test resetting the event bus."""
         bus = EventBus()
@@ -278,4 +623,4 @@ class TestEventBus:
 
         assert bus._subscribers == {}
         assert len(bus._event_history) == 0
-        assert bus._processing is False
+        assert bus._dispatcher_task is None
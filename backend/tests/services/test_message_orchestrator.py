@@ -4,14 +4,20 @@ Tests streaming lifecycle, chunk processing, and persistence coordination.
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.services.message_orchestrator import MessageOrchestrator
+from app.services.message_orchestrator import MessageOrchestrator, _iso_now
 from app.services.message_persistence import MessagePersistenceService
 from app.services.streaming_buffer import StreamingBuffer, StreamMetadata
 from app.services.event_bus import EventBus, StreamingEvent
 
 
+def _payload(call):
+    """Resolve the payload of an emit call, invoking lazy payload factories."""
+    data = call[0][1]
+    return data() if callable(data) else data
+
+
 @pytest.fixture
 def mock_persistence():
     """Create a mock persistence service."""
@@ -161,7 +167,7 @@ class TestProcessAction:
             if c[0][0] == StreamingEvent.ACTION_STREAMING
         ]
         assert len(action_calls) == 1
-        event_data = action_calls[0][0][1]
+        event_data = _payload(action_calls[0])
         assert event_data["tool"] == "bash"
         assert event_data["step"] == 1
 
@@ -181,7 +187,7 @@ class TestProcessAction:
             if c[0][0] == StreamingEvent.ACTION_COMPLETE
         ]
         assert len(action_calls) == 1
-        event_data = action_calls[0][0][1]
+        event_data = _payload(action_calls[0])
         assert event_data["tool"] == "file_read"
         assert event_data["args"]["path"] == "/test.txt"
 
@@ -204,7 +210,7 @@ class TestProcessObservation:
             c for c in mock_event_bus.emit.call_args_list if c[0][0] == StreamingEvent.OBSERVATION
         ]
         assert len(obs_calls) == 1
-        event_data = obs_calls[0][0][1]
+        event_data = _payload(obs_calls[0])
         assert event_data["content"] == "File read successfully"
         assert event_data["success"] is True
 
@@ -218,7 +224,7 @@ class TestProcessObservation:
             c for c in mock_event_bus.emit.call_args_list if c[0][0] == StreamingEvent.OBSERVATION
         ]
         assert len(obs_calls) == 1
-        assert obs_calls[0][0][1]["success"] is False
+        assert _payload(obs_calls[0])["success"] is False
 
 
 @pytest.mark.asyncio
@@ -243,6 +249,7 @@ class TestCompleteStreaming:
 
         # Verify message removed from active streams
         assert "msg-123" not in orchestrator._active_streams
+        assert "session-123" not in orchestrator._streams_by_session
 
     async def test_complete_streaming_emits_events(self, orchestrator, mock_event_bus):
         """Test that completion emits proper events."""
@@ -362,6 +369,9 @@ class TestStreamingStatus:
         assert "msg-123" in streams
         assert "msg-456" in streams
 
+        with pytest.raises(TypeError):
+            streams["msg-789"] = "session-3"
+
     async def test_is_streaming_true(self, orchestrator, mock_buffer):
         """Test is_streaming when actively streaming."""
         await orchestrator.start_streaming(session_id="session-123")
@@ -423,3 +433,34 @@ class TestCleanupIncompleteStreams:
         cleaned = await orchestrator.cleanup_incomplete_streams("empty-session")
 
         assert cleaned == 0
+
+
+class TestIsoNow:
+    """Test the shared event timestamp helper."""
+
+    def test_reuses_timestamp_within_window(self):
+        """Test that calls in the same ~1ms window share one formatted string."""
+        with patch("app.services.message_orchestrator.time.monotonic_ns", return_value=5 << 20):
+            first = _iso_now()
+            second = _iso_now()
+
+        assert first is second
+
+    def test_refreshes_timestamp_in_new_window(self):
+        """Test that a later window formats a fresh timestamp."""
+        with patch("app.services.message_orchestrator.time.monotonic_ns", return_value=7 << 20):
+            first = _iso_now()
+        with (
+            patch("app.services.message_orchestrator.datetime") as mock_datetime,
+            patch("app.services.message_orchestrator.time.monotonic_ns", return_value=8 << 20),
+        ):
+            mock_datetime.now.return_value.isoformat.return_value = "later"
+            second = _iso_now()
+
+        assert first != second
+        assert second == "later"
+
+    def test_timestamp_is_timezone_aware(self):
+        """Test that timestamps carry an explicit UTC offset."""
+        with patch("app.services.message_orchestrator.time.monotonic_ns", return_value=9 << 20):
+            assert _iso_now().endswith("+00:00")
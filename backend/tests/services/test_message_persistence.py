@@ -0,0 +1,86 @@
+"""
+Tests for MessagePersistenceService against the test database.
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.models.database import Message, MessageRole
+from app.services.message_persistence import MessagePersistenceService
+
+
+async def _add_message(db_session, chat_session_id, content="", metadata=None):
+    message = Message(
+        chat_session_id=chat_session_id,
+        role=MessageRole.ASSISTANT,
+        content=content,
+        message_metadata=metadata or {},
+    )
+    db_session.add(message)
+    await db_session.flush()
+    return message.id
+
+
+async def _load(db_session, message_id):
+    db_session.expunge_all()
+    return await db_session.scalar(select(Message).where(Message.id == message_id))
+
+
+@pytest.mark.unit
+class TestMessagePersistenceService:
+    """Test MessagePersistenceService updates."""
+
+    @pytest.mark.asyncio
+    async def test_save_complete_message(self, db_session, sample_chat_session):
+        """Test saving the final content and merging metadata."""
+        message_id = await _add_message(
+            db_session, sample_chat_session.id, "partial", {"model": "gpt-4"}
+        )
+        persistence = MessagePersistenceService(db_session)
+
+        assert await persistence.save_complete_message(message_id, "final content", {"tokens": 12})
+
+        message = await _load(db_session, message_id)
+        assert message.content == "final content"
+        assert message.message_metadata == {"model": "gpt-4", "tokens": 12}
+
+    @pytest.mark.asyncio
+    async def test_save_complete_messages(self, db_session, sample_chat_session):
+        """Test saving a batch, skipping IDs that do not exist."""
+        first = await _add_message(db_session, sample_chat_session.id, metadata={"a": 1})
+        second = await _add_message(db_session, sample_chat_session.id)
+        persistence = MessagePersistenceService(db_session)
+
+        saved = await persistence.save_complete_messages(
+            [(first, "one", {"b": 2}), (second, "two", None), ("missing-id", "three", None)]
+        )
+
+        assert saved == {first, second}
+        message = await _load(db_session, first)
+        assert message.content == "one"
+        assert message.message_metadata == {"a": 1, "b": 2}
+        message = await _load(db_session, second)
+        assert message.content == "two"
+
+    @pytest.mark.asyncio
+    async def test_update_message_content(self, db_session, sample_chat_session):
+        """Test partial content updates."""
+        message_id = await _add_message(db_session, sample_chat_session.id)
+        persistence = MessagePersistenceService(db_session)
+
+        assert await persistence.update_message_content(message_id, "streamed so far")
+        assert not await persistence.update_message_content("missing-id", "content")
+
+        message = await _load(db_session, message_id)
+        assert message.content == "streamed so far"
+
+    @pytest.mark.asyncio
+    async def test_mark_message_incomplete(self, db_session, sample_chat_session):
+        """Test recording the interruption in the message metadata."""
+        message_id = await _add_message(db_session, sample_chat_session.id, metadata={"a": 1})
+        persistence = MessagePersistenceService(db_session)
+
+        await persistence.mark_message_incomplete(message_id)
+
+        message = await _load(db_session, message_id)
+        assert message.message_metadata == {"a": 1, "error": "Streaming interrupted"}
@@ -1,6 +1,7 @@
 """Tests for StreamingBuffer service."""
 
 import pytest
+import threading
 import time
 
 from app.services.streaming_buffer import StreamingBuffer, StreamMetadata
@@ -54,7 +55,8 @@ class TestStreamingBuffer:
         buffer.add_chunk(message_id, "Hello")
         buffer.add_chunk(message_id, " World")
 
-        assert len(buffer._buffers[message_id]) == 2
+        assert len(buffer._offsets[message_id]) == 2
+        assert bytes(buffer._buffers[message_id]) == b"Hello World"
         assert buffer._metadata[message_id].chunk_count == 2
         assert buffer._metadata[message_id].total_bytes == 11
 
@@ -79,7 +81,22 @@ class TestStreamingBuffer:
             buffer.add_chunk(message_id, f"chunk{i}")
 
         # Buffer should be truncated to last 1000 (or less if max is lower)
-        assert len(buffer._buffers[message_id]) <= 1000
+        assert len(buffer._offsets[message_id]) <= 1000
+        assert buffer.get_chunks_since(message_id, 0)[-1] == "chunk149"
+
+    def test_small_buffer_stays_bounded(self):
+        """Test a limit below 1000 chunks is enforced without truncating every chunk."""
+        buffer = StreamingBuffer(max_buffer_size=10)
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        for i in range(100):
+            buffer.add_chunk(message_id, f"chunk{i}")
+            assert len(buffer._offsets[message_id]) <= 10
+
+        chunks = buffer.get_chunks_since(message_id, 0)
+        assert chunks[-1] == "chunk99"
+        assert chunks == [f"chunk{i}" for i in range(100 - len(chunks), 100)]
 
     def test_get_complete_content(self):
         """Test getting complete content."""
@@ -94,6 +111,40 @@ class TestStreamingBuffer:
         content = buffer.get_complete_content(message_id)
         assert content == "Hello World"
 
+    def test_get_complete_content_is_cached_until_next_chunk(self):
+        """Test repeated reads reuse the joined string until a chunk arrives."""
+        buffer = StreamingBuffer()
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        buffer.add_chunk(message_id, "Hello")
+
+        first = buffer.get_complete_content(message_id)
+        assert buffer.get_complete_content(message_id) is first
+
+        buffer.add_chunk(message_id, " World")
+        assert buffer.get_complete_content(message_id) == "Hello World"
+
+        buffer.reset_buffer(message_id)
+        assert buffer.get_complete_content(message_id) == ""
+
+        buffer.cleanup(message_id)
+        assert message_id not in buffer._joined_cache
+
+    def test_add_chunk_accepts_bytes(self):
+        """Test mixing text and pre-encoded chunks, with byte-accurate metadata."""
+        buffer = StreamingBuffer()
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        buffer.add_chunk(message_id, "héllo ")
+        buffer.add_chunk(message_id, "wörld".encode())
+
+        assert buffer.get_complete_content(message_id) == "héllo wörld"
+        assert buffer.get_complete_bytes(message_id) == "héllo wörld".encode()
+        assert buffer.get_metadata(message_id).total_bytes == len("héllo wörld".encode())
+        assert buffer.get_complete_bytes("nonexistent") == b""
+
     def test_get_complete_content_no_buffer(self):
         """Test getting content for non-existent buffer."""
         buffer = StreamingBuffer()
@@ -114,6 +165,68 @@ class TestStreamingBuffer:
         assert len(chunks) == 3
         assert chunks == ["chunk2", "chunk3", "chunk4"]
 
+    def test_get_chunks_since_multibyte_and_negative_index(self):
+        """Test chunk boundaries survive UTF-8 encoding and list-style indexing."""
+        buffer = StreamingBuffer()
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        for chunk in ("héllo", " ", "wörld", "✓"):
+            buffer.add_chunk(message_id, chunk)
+
+        assert buffer.get_chunks_since(message_id, 2) == ["wörld", "✓"]
+        assert buffer.get_chunks_since(message_id, -1) == ["✓"]
+        assert buffer.get_chunks_since(message_id, 10) == []
+        assert buffer.get_complete_content(message_id) == "héllo wörld✓"
+
+    def test_overflow_truncation_keeps_chunk_boundaries(self):
+        """Test truncation drops whole leading chunks only."""
+        buffer = StreamingBuffer(max_buffer_size=2000)
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        for i in range(2001):
+            buffer.add_chunk(message_id, f"c{i};")
+
+        chunks = buffer.get_chunks_since(message_id, 0)
+        assert len(chunks) == 1001
+        assert chunks[0] == "c1000;"
+        assert buffer.get_complete_content(message_id) == "".join(chunks)
+
+    def test_get_bytes_since(self):
+        """Test getting encoded content since a chunk index."""
+        buffer = StreamingBuffer()
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        for chunk in ("héllo", " ", "wörld"):
+            buffer.add_chunk(message_id, chunk)
+
+        assert buffer.get_bytes_since(message_id, 1) == " wörld".encode()
+        assert buffer.get_bytes_since(message_id, -1) == "wörld".encode()
+        assert buffer.get_bytes_since(message_id, 3) == b""
+        assert buffer.get_bytes_since("nonexistent", 0) == b""
+
+        # No view is left exported, so the buffer can keep growing
+        buffer.add_chunk(message_id, "!")
+        assert buffer.get_complete_content(message_id) == "héllo wörld!"
+
+    def test_get_content_since(self):
+        """Test getting joined content since a chunk index."""
+        buffer = StreamingBuffer()
+        message_id = "msg-123"
+
+        buffer.start_streaming(message_id)
+        for i in range(5):
+            buffer.add_chunk(message_id, f"chunk{i}")
+
+        assert buffer.get_content_since(message_id, 2) == "".join(
+            buffer.get_chunks_since(message_id, 2)
+        )
+        assert buffer.get_content_since(message_id, 0) == buffer.get_complete_content(message_id)
+        assert buffer.get_content_since(message_id, 5) == ""
+        assert buffer.get_content_since("nonexistent", 0) == ""
+
     def test_get_chunks_since_no_buffer(self):
         """Test getting chunks for non-existent buffer."""
         buffer = StreamingBuffer()
@@ -220,6 +333,37 @@ class TestStreamingBuffer:
         assert usage["total_bytes"] == 14
         assert usage["active_streams"] == 2
 
+    def test_memory_usage_tracks_truncation_cleanup_and_reset(self):
+        """Test the running totals match the buffers after every mutation."""
+        buffer = StreamingBuffer(max_buffer_size=10)
+
+        def expected():
+            return (
+                sum(len(offsets) for offsets in buffer._offsets.values()),
+                sum(len(buf) for buf in buffer._buffers.values()),
+            )
+
+        buffer.start_streaming("msg-1")
+        buffer.start_streaming("msg-2")
+        for i in range(25):
+            buffer.add_chunk("msg-1", f"é{i}")
+        buffer.add_chunk("msg-2", "test")
+        usage = buffer.get_memory_usage()
+        assert (usage["total_chunks"], usage["total_bytes"]) == expected()
+
+        buffer.reset_buffer("msg-1")
+        buffer.start_streaming("msg-2")
+        usage = buffer.get_memory_usage()
+        assert (usage["total_chunks"], usage["total_bytes"]) == expected() == (0, 0)
+
+        buffer.add_chunk("msg-2", "again")
+        buffer.end_streaming("msg-2")
+        buffer.cleanup("msg-1")
+        usage = buffer.get_memory_usage()
+        assert (usage["total_chunks"], usage["total_bytes"]) == expected() == (1, 5)
+        assert usage["active_streams"] == 0
+        assert usage["buffer_count"] == 1
+
     def test_has_buffer(self):
         """Test checking if buffer exists."""
         buffer = StreamingBuffer()
@@ -241,6 +385,7 @@ class TestStreamingBuffer:
         buffer.reset_buffer(message_id)
 
         assert len(buffer._buffers[message_id]) == 0
+        assert len(buffer._offsets[message_id]) == 0
         assert buffer._metadata[message_id].chunk_count == 0
         assert buffer._metadata[message_id].total_bytes == 0
 
@@ -248,3 +393,53 @@ class TestStreamingBuffer:
         """Test resetting non-existent buffer (should not raise)."""
         buffer = StreamingBuffer()
         buffer.reset_buffer("nonexistent")  # Should not raise
+
+    def test_concurrent_writers_keep_state_consistent(self):
+        """Test threads appending to several messages leave consistent buffers and totals."""
+        buffer = StreamingBuffer(max_buffer_size=50)
+        message_ids = [f"msg-{i}" for i in range(4)]
+        for message_id in message_ids:
+            buffer.start_streaming(message_id)
+
+        def write(message_id):
+            for i in range(500):
+                buffer.add_chunk(message_id, f"{i},")
+                buffer.get_content_since(message_id, -3)
+
+        threads = [
+            threading.Thread(target=write, args=(message_id,))
+            for message_id in message_ids
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        usage = buffer.get_memory_usage()
+        assert usage["total_chunks"] == sum(len(buffer._offsets[m]) for m in message_ids)
+        assert usage["total_bytes"] == sum(len(buffer._buffers[m]) for m in message_ids)
+        for message_id in message_ids:
+            assert buffer._metadata[message_id].chunk_count == 1000
+            offsets = buffer._offsets[message_id]
+            assert offsets[-1] == len(buffer._buffers[message_id])
+            assert "".join(buffer.get_chunks_since(message_id, 0)) == buffer.get_complete_content(
+                message_id
+            )
+
+    def test_lookups_do_not_create_buffers(self):
+        """Test that accessing unknown messages never allocates a phantom buffer."""
+        buffer = StreamingBuffer()
+
+        buffer.get_complete_content("ghost")
+        buffer.get_chunks_since("ghost", 0)
+        buffer.get_bytes_since("ghost", 0)
+        buffer.has_buffer("ghost")
+        buffer.reset_buffer("ghost")
+        buffer.cleanup("ghost")
+        with pytest.raises(ValueError):
+            buffer.add_chunk("ghost", "chunk")
+
+        assert buffer._buffers == {}
+        assert buffer._offsets == {}
+        assert buffer.get_memory_usage()["buffer_count"] == 0